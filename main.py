@@ -5,142 +5,269 @@ Provides command-line interface for extracting, converting, and decompiling
 the Oregon Trail game files.
 """
 
-import argparse
+import hashlib
+import io
+import json
 import logging
 import os
+import shutil
 import sys
+import traceback
 import importlib
+from types import SimpleNamespace
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-from tools.gxl_extractor import GXLExtractor, set_debug as set_gxl_debug
-from tools.convert import convert_all, set_debug as set_convert_debug
+try:
+    import orjson
+except ImportError:
+    # Fall back to the stdlib encoder when orjson isn't installed
+    orjson = None
+
+# tools.gxl_extractor and tools.convert are imported inside the commands
+# that need them so `decompile` and `--help` don't load every converter
 from tools.decompiler.utils import setup_logging
 
 # Configure logging
 logger = logging.getLogger(__name__)
 setup_logging(level=logging.INFO)
 
+# Bump whenever the shape of GXLExtractor.analyze() results changes
+ANALYSIS_CACHE_VERSION = 2
+
+# GXL analysis results are cached per user, never beside the game files
+ANALYSIS_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "oregon-trail-decompiler",
+    "gxl-analysis",
+)
+
+# Fixed-shape parts of the GXL text report
+GXL_REPORT_HEADER = """\
+Analysis of {filename}:
+  File type: {type}
+  Total entries: {num_entries}
+  Total size: {total_file_size} bytes
+"""
+GXL_REPORT_STRUCTURE = """\
+    File structure:
+      Total file size: {file_size} bytes
+      Header size: {header_size} bytes
+      File table size: {file_table_size} bytes
+      Data size: {data_size} bytes"""
+
+
+def _analyze_cached(extractor, filename, use_cache=True):
+    """Return extractor.analyze() results, reusing an on-disk cache if valid
+
+    Each archive gets a <hash of its absolute path>.analyze.json file under
+    ANALYSIS_CACHE_DIR, keyed on the archive's mtime and size plus
+    ANALYSIS_CACHE_VERSION. It is plain JSON, so a planted cache file can at
+    worst supply bad analysis data, never run code.
+    """
+    if not use_cache:
+        return extractor.analyze()
+
+    stat = os.stat(filename)
+    path_hash = hashlib.sha256(os.path.abspath(filename).encode("utf-8"))
+    cache_path = os.path.join(
+        ANALYSIS_CACHE_DIR, f"{path_hash.hexdigest()[:32]}.analyze.json"
+    )
+    key = [ANALYSIS_CACHE_VERSION, stat.st_mtime_ns, stat.st_size]
 
-def extract_gxl(args):
-    """Handle GXL extraction command"""
-    set_gxl_debug(args.debug)
+    try:
+        with open(cache_path, "rb") as f:
+            data = f.read()
+        # orjson.JSONDecodeError and json.JSONDecodeError subclass ValueError
+        cached = orjson.loads(data) if orjson is not None else json.loads(data)
+        if cached["key"] == key and isinstance(cached["info"], dict):
+            logger.debug(f"Using cached analysis for {filename}")
+            return cached["info"]
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+
+    info = extractor.analyze()
 
-    # Create output directory if needed
-    if not args.analyze and not os.path.exists(args.output):
-        os.makedirs(args.output)
+    try:
+        payload = {"key": key, "info": info}
+        os.makedirs(ANALYSIS_CACHE_DIR, exist_ok=True)
+        with open(cache_path, "wb") as f:
+            if orjson is not None:
+                f.write(orjson.dumps(payload))
+            else:
+                f.write(json.dumps(payload).encode("utf-8"))
+    except (OSError, TypeError) as e:
+        logger.debug(f"Could not write analysis cache {cache_path}: {str(e)}")
 
-    # Process each input file
-    for filename in args.files:
-        if not os.path.exists(filename):
-            logger.error(f"File not found: {filename}")
-            continue
+    return info
 
-        extractor = GXLExtractor(filename)
 
-        # Analyze file
-        info = extractor.analyze()
+def _process_one_gxl(filename, output, analyze, no_verify, debug, use_cache=True):
+    """Analyze and optionally extract a single GXL file
 
-        # Output analysis in requested format
-        if args.format == "json":
-            import json
+    Kept at module level so it can be pickled into a worker process.
 
-            try:
-                json_output = json.dumps(
-                    info, indent=2, default=lambda obj: str(obj), separators=(",", ": ")
-                )
-                print(json_output)
-            except TypeError as e:
-                logger.error(f"JSON serialization error: {str(e)}")
-                logger.error("Falling back to text format")
-                args.format = "text"
-        else:
-            logger.info(f"Analysis of {filename}:")
-            logger.info(f"  File type: {info['type']}")
-            logger.info(f"  Total entries: {info['num_entries']}")
-            logger.info(f"  Total size: {info['total_file_size']} bytes")
-
-            # File type statistics
-            logger.info("  File types:")
-            for ftype, count in info["file_types"].items():
-                logger.info(f"    {ftype}: {count}")
-
-            # Image statistics
-            if info["images"]["count"] > 0:
-                logger.info("  Images:")
-                logger.info(f"    Count: {info['images']['count']}")
-                logger.info(f"    Total size: {info['images']['total_size']} bytes")
-                logger.info(f"    Average size: {info['images']['avg_size']:.1f} bytes")
-                logger.info("    Dimensions:")
-                logger.info(
-                    f"      Width: {info['images']['dimensions']['min_width']} - {info['images']['dimensions']['max_width']}"
-                )
-                logger.info(
-                    f"      Height: {info['images']['dimensions']['min_height']} - {info['images']['dimensions']['max_height']}"
-                )
+    Returns:
+        tuple of (filename, success, info), info is None if the file is missing
+    """
+    from tools.gxl_extractor import GXLExtractor, set_debug as set_gxl_debug
 
-            # Show completeness information
-            completeness = info["completeness"]
-            logger.info("\n  Completeness check:")
-            if completeness["complete"]:
-                logger.info(
-                    "    Status: COMPLETE - All bytes in the file are accounted for"
+    set_gxl_debug(debug)
+
+    try:
+        extractor = GXLExtractor(filename)
+        info = _analyze_cached(extractor, filename, use_cache)
+    except FileNotFoundError:
+        return filename, False, None
+
+    success = True
+    if not analyze:
+        success = extractor.extract_all_files(
+            output, verify_integrity=not no_verify
+        )
+
+    return filename, success, info
+
+
+def _report_gxl(args, filename, success, info):
+    """Log the analysis and extraction results for one GXL file"""
+    if info is None:
+        logger.error(f"File not found: {filename}")
+        return
+
+    # Output analysis in requested format
+    if args.format == "json":
+        try:
+            if orjson is not None:
+                # orjson.JSONEncodeError subclasses TypeError
+                sys.stdout.flush()
+                sys.stdout.buffer.write(
+                    orjson.dumps(info, default=str, option=orjson.OPT_INDENT_2)
                 )
+                sys.stdout.buffer.write(b"\n")
+                sys.stdout.buffer.flush()
             else:
-                unaccounted = completeness["unaccounted_bytes"]
-                percentage = completeness["unaccounted_percentage"]
-                logger.info(
-                    f"    Status: INCOMPLETE - {unaccounted} bytes ({percentage:.2f}%) not accounted for"
-                )
+                print(json.dumps(info, indent=2, default=str))
+        except TypeError as e:
+            logger.error(f"JSON serialization error: {str(e)}")
+            logger.error("Falling back to text format")
+            args.format = "text"
+    else:
+        images = info["images"]
+        completeness = info["completeness"]
+
+        buf = io.StringIO()
+        buf.write(
+            GXL_REPORT_HEADER.format(
+                filename=filename,
+                type=info["type"],
+                num_entries=info["num_entries"],
+                total_file_size=info["total_file_size"],
+            )
+        )
 
-                if completeness["gaps"]:
-                    logger.info(
-                        f"    Found {len(completeness['gaps'])} gaps between files:"
-                    )
-                    for i, gap in enumerate(completeness["gaps"]):
-                        logger.info(
-                            f"      Gap {i + 1}: {gap['size']} bytes between {gap['after_file']} and {gap['before_file']}"
-                        )
-                        logger.info(
-                            f"             (offset 0x{gap['start_offset']:X} - 0x{gap['end_offset']:X})"
-                        )
-
-                if completeness["potential_hidden_files"]:
-                    logger.info("    Potential hidden files detected:")
-                    for i, file in enumerate(completeness["potential_hidden_files"]):
-                        logger.info(
-                            f"      File {i + 1}: {file['potential_type']} at offset 0x{file['offset']:X}, size {file['size']} bytes"
-                        )
-
-            logger.info("    File structure:")
-            logger.info(f"      Total file size: {completeness['file_size']} bytes")
-            logger.info(f"      Header size: {completeness['header_size']} bytes")
-            logger.info(
-                f"      File table size: {completeness['file_table_size']} bytes"
+        # File type statistics
+        buf.write("  File types:\n")
+        buf.write(
+            "".join(
+                f"    {ftype}: {count}\n" for ftype, count in info["file_types"].items()
             )
-            logger.info(
-                f"      Data size: {sum(entry['size'] for entry in info['entries'])} bytes"
+        )
+
+        # Image statistics
+        if images["count"] > 0:
+            dims = images["dimensions"]
+            buf.write("  Images:\n")
+            buf.write(f"    Count: {images['count']}\n")
+            buf.write(f"    Total size: {images['total_size']} bytes\n")
+            buf.write(f"    Average size: {images['avg_size']:.1f} bytes\n")
+            buf.write("    Dimensions:\n")
+            buf.write(f"      Width: {dims['min_width']} - {dims['max_width']}\n")
+            buf.write(f"      Height: {dims['min_height']} - {dims['max_height']}\n")
+
+        # Show completeness information
+        buf.write("\n  Completeness check:\n")
+        if completeness["complete"]:
+            buf.write("    Status: COMPLETE - All bytes in the file are accounted for\n")
+        else:
+            unaccounted = completeness["unaccounted_bytes"]
+            percentage = completeness["unaccounted_percentage"]
+            buf.write(
+                f"    Status: INCOMPLETE - {unaccounted} bytes ({percentage:.2f}%) not accounted for\n"
             )
 
-        # Extract if requested
-        if not args.analyze:
-            verify_integrity = not args.no_verify
-            if verify_integrity:
-                logger.info("File integrity verification enabled")
-            else:
-                logger.info("File integrity verification disabled")
+            if completeness["gaps"]:
+                buf.write(f"    Found {len(completeness['gaps'])} gaps between files:\n")
+                buf.write(
+                    "".join(
+                        f"      Gap {i + 1}: {gap['size']} bytes between {gap['after_file']} and {gap['before_file']}\n"
+                        f"             (offset 0x{gap['start_offset']:X} - 0x{gap['end_offset']:X})\n"
+                        for i, gap in enumerate(completeness["gaps"])
+                    )
+                )
 
-            if extractor.extract_all_files(
-                args.output, verify_integrity=verify_integrity
-            ):
-                # Success already logged in extract_all_files
-                pass
-            else:
-                logger.warning(
-                    f"Extraction from {filename} had issues - check log for details"
+            if completeness["potential_hidden_files"]:
+                buf.write("    Potential hidden files detected:\n")
+                buf.write(
+                    "".join(
+                        f"      File {i + 1}: {file['potential_type']} at offset 0x{file['offset']:X}, size {file['size']} bytes\n"
+                        for i, file in enumerate(completeness["potential_hidden_files"])
+                    )
                 )
 
+        buf.write(GXL_REPORT_STRUCTURE.format_map(completeness))
+
+        # Emit the whole report as one record so it isn't interleaved
+        logger.info("\n%s", buf.getvalue())
+
+    if not args.analyze and not success:
+        logger.warning(
+            f"Extraction from {filename} had issues - check log for details"
+        )
+
+
+def extract_gxl(args):
+    """Handle GXL extraction command"""
+    from tools.gxl_extractor import set_debug as set_gxl_debug
+
+    set_gxl_debug(args.debug)
+
+    # Create the output directory and report the verification mode only
+    # when files are going to be extracted
+    if not args.analyze:
+        os.makedirs(args.output, exist_ok=True)
+        if args.no_verify:
+            logger.info("File integrity verification disabled")
+        else:
+            logger.info("File integrity verification enabled")
+
+    task_args = (
+        args.output,
+        args.analyze,
+        args.no_verify,
+        args.debug,
+        not args.no_cache,
+    )
+
+    # Skip the pool overhead for the common single-file case
+    if len(args.files) == 1:
+        _report_gxl(args, *_process_one_gxl(args.files[0], *task_args))
+        return
+
+    # Archives are independent, so fan them out across cores and report
+    # each one from the parent process as it finishes
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [
+            executor.submit(_process_one_gxl, filename, *task_args)
+            for filename in args.files
+        ]
+        for future in as_completed(futures):
+            _report_gxl(args, *future.result())
+
 
 def convert_files(args):
     """Handle file conversion command"""
+    from tools.convert import convert_all, set_debug as set_convert_debug
+
     set_convert_debug(args.debug)
 
     if convert_all(args.input_dir, args.output, args.type):
@@ -150,35 +277,48 @@ def convert_files(args):
         sys.exit(1)
 
 
+def _remove_tree(path):
+    """Recursively delete a directory tree
+
+    Returns:
+        bool: True if the tree was removed, False if it didn't exist
+    """
+    try:
+        shutil.rmtree(path, ignore_errors=False)
+    except FileNotFoundError:
+        return False
+    return True
+
+
 def clean_directories():
     """Remove raw_extracted and docs/modern directories"""
     for dir_path in ["raw_extracted", "docs/modern"]:
-        if os.path.exists(dir_path):
-            logger.info(f"Removing {dir_path} directory")
-            import shutil
-
-            shutil.rmtree(dir_path)
+        if _remove_tree(dir_path):
+            logger.info(f"Removed {dir_path} directory")
 
 
 def process_all():
     """Extract and convert all files"""
+    from tools.convert import convert_all
+
     # Clean directories first
     clean_directories()
 
     # Extract all files from GXL archives
-    extract_args = argparse.Namespace(
+    extract_args = SimpleNamespace(
         files=["original_game/OREGON.GXL"],
         output="raw_extracted",
         analyze=False,
         debug=False,
         format="text",
         no_verify=False,
+        no_cache=False,
     )
     extract_gxl(extract_args)
 
     # Convert all files (both extracted and original)
     logger.info("Converting all game files")
-    convert_args = argparse.Namespace(
+    convert_args = SimpleNamespace(
         input_dir="raw_extracted",
         output="docs/modern",
         type=None,  # Convert all types
@@ -188,7 +328,7 @@ def process_all():
 
     # Process additional files from original_game
     logger.info("Processing additional game files")
-    convert_args = argparse.Namespace(
+    convert_args = SimpleNamespace(
         input_dir="original_game", output="docs/modern", type=None, debug=False
     )
     # Don't clean directories again
@@ -248,28 +388,43 @@ def decompile_executable(args):
         
         logger.info(f"Running decompiler with command: python -m tools.decompiler.main {' '.join(sys_args)}")
         
-        # Use subprocess instead of directly calling the module
-        import subprocess
-        full_command = [sys.executable, "-m", "tools.decompiler.main"] + sys_args
+        # Call the already-imported module in-process so its logs stream live.
+        # Its main() reconfigures root logging, so put ours back afterwards.
+        saved_argv = sys.argv
+        root_logger = logging.getLogger()
+        saved_handlers = root_logger.handlers[:]
+        saved_level = root_logger.level
+        sys.argv = ["tools.decompiler.main"] + sys_args
+        try:
+            returncode = decompiler_main.main() or 0
+        except SystemExit as e:
+            # Mirror the interpreter: None is success, non-int codes fail
+            code = e.code
+            returncode = 0 if code is None else code if isinstance(code, int) else 1
+        finally:
+            sys.argv = saved_argv
+            root_logger.handlers[:] = saved_handlers
+            root_logger.setLevel(saved_level)
         
-        logger.info(f"Executing: {' '.join(full_command)}")
-        result = subprocess.run(full_command, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            logger.error(f"Decompiler failed with return code {result.returncode}")
-            logger.error(f"Error output: {result.stderr}")
+        if returncode != 0:
+            logger.error(f"Decompiler failed with return code {returncode}")
         else:
             logger.info(f"Decompiler completed successfully")
             logger.info(f"Output directory: {os.path.abspath(args.output)}")
             
     except Exception as e:
         logger.error(f"Error running decompiler: {str(e)}")
-        import traceback
         logger.error(traceback.format_exc())
 
 
 def main():
     """Main entry point"""
+    # The default no-argument pipeline run doesn't need argparse at all
+    if len(sys.argv) == 1:
+        return process_all()
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Oregon Trail Decompiler Tools - Extracts, converts, and decompiles game assets"
     )
@@ -305,6 +460,11 @@ def main():
     extract_parser.add_argument(
         "--no-verify", action="store_true", help="Disable file integrity verification"
     )
+    extract_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and don't write the cached GXL analysis in the user cache directory",
+    )
 
     # Convert command
     convert_parser = subparsers.add_parser(
@@ -0,0 +1,6 @@
+"""
+Tests for the Oregon Trail decompilation tools.
+
+Test modules import the project (``tools``, ``main``) and the shared
+fixtures (``tests._fixtures``) relative to the repository root.
+"""
@@ -0,0 +1,181 @@
+"""
+Shared sample files for the converter tests.
+
+The fixtures are written once per test process into a single temporary
+directory, which is removed when the process exits. Test classes create
+their own output subdirectories under ``temp_dir``.
+"""
+
+import atexit
+import hashlib
+import os
+import shutil
+import tempfile
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+
+from tools.pcx_utils import setup_logging
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RAW_DIR = PROJECT_ROOT / "raw_extracted"
+
+# Keep scratch output in RAM where a writable tmpfs is available
+SCRATCH_ROOT = "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+
+# Simple ANI animation
+SAMPLE_ANI_TEXT = "TITLE.PC8\n2\n10,20\n100,50\n30,40\n200,100\n"
+
+# Simple CTR control file
+SAMPLE_CTR_TEXT = """\
+17,let's load the images
+1,1
+OKAY.PCC
+17,icon buttons
+4,200 5,350
+6,135 7,120
+12,0,6
+6,215 7,290
+8,0,0,1,28
+6,315 7,290
+8,0,1,99,1
+6,135 7,120
+11,4,1,2
+6,135 7,120
+11,2,1,3
+6,135 7,120
+11,1,1,4
+"""
+
+# 0.5 seconds of 8-bit silence at 11025 Hz
+SAMPLE_SND_BYTES = b"\x80" * 5512
+
+SAMPLE_TXT_TEXT = "This is a test text file.\n"
+
+
+@lru_cache(maxsize=None)
+def _raw_index() -> dict[str, tuple[Path, ...]]:
+    """Scan raw_extracted once and bucket its files by upper-case suffix"""
+    index = defaultdict(list)
+    try:
+        with os.scandir(RAW_DIR) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    suffix = os.path.splitext(entry.name)[1].upper()
+                    index[suffix].append(Path(entry.path))
+    except FileNotFoundError:
+        pass
+    return {suffix: tuple(sorted(paths)) for suffix, paths in index.items()}
+
+
+@lru_cache(maxsize=None)
+def setup_pcx_logging() -> None:
+    """Configure the PCX converters' logging once per test process"""
+    setup_logging(False)
+
+
+def list_raw(suffix: str) -> tuple[Path, ...]:
+    """Return the raw_extracted files with the given suffix (e.g. ".ANI")"""
+    return _raw_index().get(suffix.upper(), ())
+
+
+def list_nonempty(directory: Path, suffix: str) -> list[Path]:
+    """Return the non-empty files in directory ending with suffix, sorted
+
+    Zero-byte files are filtered out using the entries os.scandir yields,
+    before anything is opened. A missing directory yields no files.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(
+                Path(entry.path)
+                for entry in entries
+                if entry.name.endswith(suffix)
+                and entry.is_file()
+                and entry.stat().st_size > 0
+            )
+    except FileNotFoundError:
+        return []
+
+
+@lru_cache(maxsize=None)
+def _sha256_cached(path: str, mtime_ns: int, size: int) -> str:
+    """Hash a file with file_digest, memoized on (path, mtime, size)"""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def sha256_file(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file
+
+    Digests are cached for the test process, so hashing an unchanged file
+    again costs a single stat() call.
+    """
+    stat = os.stat(path)
+    return _sha256_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def scratch_directory() -> tempfile.TemporaryDirectory:
+    """Create a temporary directory, on /dev/shm when it is writable"""
+    return tempfile.TemporaryDirectory(dir=SCRATCH_ROOT)
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Symlink src to dst, copying instead where symlinks aren't permitted"""
+    try:
+        os.symlink(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+
+
+@lru_cache(maxsize=None)
+def sample_files() -> SimpleNamespace:
+    """Create the shared sample input files on first use
+
+    Returns:
+        SimpleNamespace with temp_dir, input_dir and the ani/ctr/snd/txt
+        paths, plus xmi/pc8 paths (None if raw_extracted has none to link)
+    """
+    tmp = scratch_directory()
+    atexit.register(tmp.cleanup)
+    temp_dir = Path(tmp.name)
+
+    input_dir = temp_dir / "input"
+    input_dir.mkdir()
+
+    ani_path = input_dir / "TEST.ANI"
+    ani_path.write_text(SAMPLE_ANI_TEXT, encoding="ascii")
+
+    ctr_path = input_dir / "TEST.CTR"
+    ctr_path.write_text(SAMPLE_CTR_TEXT, encoding="ascii")
+
+    snd_path = input_dir / "TEST.SND"
+    snd_path.write_bytes(SAMPLE_SND_BYTES)
+
+    txt_path = input_dir / "TEST.TXT"
+    txt_path.write_text(SAMPLE_TXT_TEXT, encoding="ascii")
+
+    # Link a real XMI and PC8 file from raw_extracted if available
+    xmi_path = None
+    xmi_files = list_raw(".XMI")
+    if xmi_files:
+        xmi_path = input_dir / "TEST.XMI"
+        _link_or_copy(xmi_files[0], xmi_path)
+
+    pc8_path = None
+    pc8_files = list_raw(".PC8")
+    if pc8_files:
+        pc8_path = input_dir / "TEST.PC8"
+        _link_or_copy(pc8_files[0], pc8_path)
+
+    return SimpleNamespace(
+        temp_dir=temp_dir,
+        input_dir=input_dir,
+        ani_path=ani_path,
+        ctr_path=ctr_path,
+        snd_path=snd_path,
+        txt_path=txt_path,
+        xmi_path=xmi_path,
+        pc8_path=pc8_path,
+    )
@@ -2,11 +2,13 @@
 """
 Test runner for Oregon Trail Decompilation project.
 
-This script discovers and runs all tests in the tests directory,
-providing command-line options for controlling test execution.
+This script discovers and runs all tests in the tests directory with pytest
+(in parallel via pytest-xdist when installed), falling back to unittest
+when pytest is unavailable.
 """
 
 import sys
+import importlib.util
 import unittest
 import argparse
 import logging
@@ -27,30 +29,68 @@ def setup_logging(verbose=False):
     return logging.getLogger("test_runner")
 
 
+def _run_unittest(pattern, verbosity, test_dir):
+    """Discover and run tests with the stdlib unittest runner
+
+    Returns:
+        int: 0 if all tests passed, 1 otherwise
+    """
+    # Discover and create test suite
+    loader = unittest.TestLoader()
+    # tests is a package, so import its modules relative to the project root
+    suite = loader.discover(
+        str(test_dir), pattern=pattern, top_level_dir=str(Path(test_dir).parent)
+    )
+
+    # Create and configure test runner
+    runner = unittest.TextTestRunner(verbosity=verbosity)
+
+    # Run tests
+    return 0 if runner.run(suite).wasSuccessful() else 1
+
+
 def discover_and_run_tests(pattern="test_*.py", verbosity=1, test_dir=None):
     """Discover and run tests matching the given pattern
 
+    Uses pytest (distributed across cores when pytest-xdist is installed)
+    and falls back to unittest discovery if pytest is unavailable.
+
     Args:
         pattern: Pattern to match test files (default: test_*.py)
         verbosity: Test runner verbosity level (default: 1)
         test_dir: Directory containing tests (default: directory of this script)
 
     Returns:
-        unittest.TestResult: Result of test execution
+        int: Exit code, 0 if all tests passed
     """
     # Default to the directory containing this script
     if test_dir is None:
         test_dir = Path(__file__).parent
 
-    # Discover and create test suite
-    loader = unittest.TestLoader()
-    suite = loader.discover(test_dir, pattern=pattern)
+    try:
+        import pytest
+    except ImportError:
+        return _run_unittest(pattern, verbosity, test_dir)
 
-    # Create and configure test runner
-    runner = unittest.TextTestRunner(verbosity=verbosity)
-
-    # Run tests
-    return runner.run(suite)
+    pytest_args = [
+        str(test_dir),
+        "-o",
+        f"python_files={pattern}",
+        "-p",
+        "no:cacheprovider",
+        f"--verbosity={verbosity - 1}",
+    ]
+    if importlib.util.find_spec("xdist") is not None:
+        pytest_args.extend(["-n", "auto"])
+
+    # Test modules may reconfigure logging against pytest's captured streams,
+    # which are closed once the session ends
+    root_logger = logging.getLogger()
+    saved_handlers = root_logger.handlers[:]
+    try:
+        return int(pytest.main(pytest_args))
+    finally:
+        root_logger.handlers[:] = saved_handlers
 
 
 def main():
@@ -98,15 +138,8 @@ def main():
         pattern=pattern, verbosity=args.verbose + 1, test_dir=args.test_dir
     )
 
-    # Print summary
-    logger.info("\nTest Summary:")
-    logger.info(f"  Ran {result.testsRun} tests")
-    logger.info(f"  Failures: {len(result.failures)}")
-    logger.info(f"  Errors: {len(result.errors)}")
-    logger.info(f"  Skipped: {len(result.skipped)}")
-
     # Exit with appropriate status code
-    if result.wasSuccessful():
+    if result == 0:
         logger.info("All tests passed!")
         return 0
     else:
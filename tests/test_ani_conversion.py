@@ -8,18 +8,10 @@ This module tests the ANI animation converter functionality, including:
 - Validating frame data structure
 """
 
-import sys
 import json
 import unittest
-import tempfile
-import shutil
-from pathlib import Path
 from tools.convert_ani import convert_ani, parse_animation
-
-# Add parent directory to path for imports
-parent_dir = str(Path(__file__).parent.parent)
-if parent_dir not in sys.path:
-    sys.path.append(parent_dir)
+from tests._fixtures import PROJECT_ROOT, SAMPLE_ANI_TEXT, list_raw, sample_files
 
 
 class ANIConverterTest(unittest.TestCase):
@@ -28,35 +20,19 @@ class ANIConverterTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up test resources"""
-        cls.temp_dir = Path(tempfile.mkdtemp())
-        cls.output_dir = cls.temp_dir / "output"
+        fixtures = sample_files()
+        cls.output_dir = fixtures.temp_dir / "ani_output"
         cls.output_dir.mkdir(exist_ok=True)
 
         # Original ANI files directory
-        cls.raw_dir = Path(parent_dir) / "raw_extracted"
-
-        # Create a test ANI file
-        cls.test_ani_file = cls.temp_dir / "TEST.ANI"
-        with open(cls.test_ani_file, "w", encoding="ascii") as f:
-            f.write("TITLE.PC8\n")
-            f.write("2\n")
-            f.write("10,20\n")
-            f.write("100,50\n")
-            f.write("30,40\n")
-            f.write("200,100\n")
+        cls.raw_dir = PROJECT_ROOT / "raw_extracted"
 
-    @classmethod
-    def tearDownClass(cls):
-        """Clean up resources"""
-        shutil.rmtree(cls.temp_dir)
+        # Shared test ANI file
+        cls.test_ani_file = fixtures.ani_path
 
     def test_parse_animation(self):
         """Test parsing ANI animation data"""
-        # Test with the sample file we created
-        with open(self.test_ani_file, "r", encoding="ascii") as f:
-            ani_text = f.read()
-
-        animation_data = parse_animation(ani_text)
+        animation_data = parse_animation(SAMPLE_ANI_TEXT)
 
         # Verify basic structure
         self.assertEqual(animation_data["image_file"], "TITLE.PC8")
@@ -109,32 +85,30 @@ class ANIConverterTest(unittest.TestCase):
         self.assertEqual(json_data["frame_count"], 1)
         self.assertEqual(len(json_data["frames"]), 1)
 
-    def test_convert_real_ani_file(self):
-        """Test converting a real ANI file if available"""
-        # Try to find a real ANI file
-        real_ani_files = list(self.raw_dir.glob("*.ANI"))
-
+    def test_convert_real_ani_files(self):
+        """Test converting each real ANI file from raw_extracted"""
+        real_ani_files = list_raw(".ANI")
         if not real_ani_files:
             self.skipTest("No real ANI files found to test")
 
-        # Test with first found ANI file
-        ani_file = real_ani_files[0]
-        result = convert_ani(ani_file, self.output_dir)
-        self.assertTrue(result)
+        for ani_file in real_ani_files:
+            with self.subTest(ani_file=ani_file.name):
+                # Each file gets its own output directory
+                output_dir = self.output_dir / "real" / ani_file.name
+                self.assertTrue(convert_ani(ani_file, output_dir))
 
-        # Check if the output file exists
-        output_path = self.output_dir / "animations" / f"{ani_file.stem}.json"
-        self.assertTrue(output_path.exists())
-
-        # Verify JSON structure
-        with open(output_path, "r", encoding="utf-8") as f:
-            json_data = json.load(f)
+                # Check if the output file exists
+                output_path = output_dir / "animations" / f"{ani_file.stem}.json"
+                self.assertTrue(output_path.exists())
 
-        self.assertIn("image_file", json_data)
-        self.assertIn("frame_count", json_data)
-        self.assertIn("frames", json_data)
-        self.assertIsInstance(json_data["frames"], list)
+                # Verify JSON structure
+                with open(output_path, "r", encoding="utf-8") as f:
+                    json_data = json.load(f)
 
+                self.assertIn("image_file", json_data)
+                self.assertIn("frame_count", json_data)
+                self.assertIn("frames", json_data)
+                self.assertIsInstance(json_data["frames"], list)
 
 if __name__ == "__main__":
     unittest.main()
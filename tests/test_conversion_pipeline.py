@@ -11,7 +11,6 @@ This module tests the end-to-end conversion pipeline, including:
 
 import sys
 import unittest
-import tempfile
 import shutil
 import logging
 import subprocess
@@ -19,12 +18,7 @@ from pathlib import Path
 import tools.convert_ani as ani_converter
 import tools.convert_ctr as ctr_converter
 from tools.convert import convert_all
-
-
-# Add parent directory to path for imports
-parent_dir = str(Path(__file__).parent.parent)
-if parent_dir not in sys.path:
-    sys.path.append(parent_dir)
+from tests._fixtures import PROJECT_ROOT, sample_files
 
 
 # Define a helper function since it's not exposed in convert.py
@@ -58,70 +52,29 @@ class ConversionPipelineTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up test resources"""
-        cls.temp_dir = Path(tempfile.mkdtemp())
-        cls.input_dir = cls.temp_dir / "input"
-        cls.input_dir.mkdir(exist_ok=True)
-        cls.output_dir = cls.temp_dir / "output"
+        fixtures = sample_files()
+        cls.input_dir = fixtures.input_dir
+        cls.output_dir = fixtures.temp_dir / "pipeline_output"
         cls.output_dir.mkdir(exist_ok=True)
 
         # Original files directory
-        cls.raw_dir = Path(parent_dir) / "raw_extracted"
+        cls.raw_dir = PROJECT_ROOT / "raw_extracted"
 
-        # Set up test logger
-        logging.basicConfig(level=logging.INFO)
+        # Set up test logger and keep per-file converter INFO logs quiet
         cls.logger = logging.getLogger("test_pipeline")
+        cls.tools_logger = logging.getLogger("tools")
+        cls.saved_tools_level = cls.tools_logger.level
+        cls.tools_logger.setLevel(logging.WARNING)
 
-        # Create sample files for each converter type
-        cls._create_test_files()
-
-    @classmethod
-    def _create_test_files(cls):
-        """Create sample files for testing each converter"""
-        # Create a simple ANI file
-        ani_file = cls.input_dir / "TEST.ANI"
-        with open(ani_file, "w", encoding="ascii") as f:
-            f.write("TITLE.PC8\n")
-            f.write("2\n")
-            f.write("10,20\n")
-            f.write("100,50\n")
-
-        # Create a simple CTR file
-        ctr_file = cls.input_dir / "TEST.CTR"
-        with open(ctr_file, "w", encoding="ascii") as f:
-            f.write("17,This is a comment\n")
-            f.write("1,1\n")
-            f.write("OKAY.PCC\n")
-            f.write("10,This is some text content\n")
-
-        # Create a simple SND file
-        snd_file = cls.input_dir / "TEST.SND"
-        with open(snd_file, "wb") as f:
-            # Create 0.5 seconds of simple 8-bit sine wave
-            f.write(bytes([128] * 5512))  # 0.5 seconds at 11025 Hz
-
-        # Create a simple text file
-        txt_file = cls.input_dir / "TEST.TXT"
-        with open(txt_file, "w", encoding="ascii") as f:
-            f.write("This is a test text file.\n")
-
-        # Copy a real XMI file from raw_extracted if available
-        xmi_files = list(cls.raw_dir.glob("*.XMI"))
-        if xmi_files:
-            shutil.copy(xmi_files[0], cls.input_dir / "TEST.XMI")
-        else:
+        if fixtures.xmi_path is None:
             cls.logger.warning("No XMI file found for testing")
-
-        # Copy a real PC8 file from raw_extracted if available
-        pc8_files = list(cls.raw_dir.glob("*.PC8"))
-        if pc8_files:
-            shutil.copy(pc8_files[0], cls.input_dir / "TEST.PC8")
-        else:
+        if fixtures.pc8_path is None:
             cls.logger.warning("No PC8 file found for testing")
 
     @classmethod
     def tearDownClass(cls):
-        """Clean up resources"""
-        shutil.rmtree(cls.temp_dir)
+        """Restore converter logging"""
+        cls.tools_logger.setLevel(cls.saved_tools_level)
 
     def test_get_converter_for_file(self):
         """Test getting the appropriate converter function for file types"""
@@ -166,45 +119,24 @@ class ConversionPipelineTest(unittest.TestCase):
 
     def test_convert_specific_file_types(self):
         """Test converting specific file types"""
-        # Test ANI conversion
-        ani_result = convert_all(
-            input_dir=str(self.input_dir),
-            output_dir=str(self.output_dir),
-            file_type="ani",
-            clean=False,
-        )
-        self.assertTrue(ani_result)
-        self.assertTrue((self.output_dir / "animations" / "TEST.json").exists())
-
-        # Test CTR conversion
-        ctr_result = convert_all(
-            input_dir=str(self.input_dir),
-            output_dir=str(self.output_dir),
-            file_type="ctr",
-            clean=False,
-        )
-        self.assertTrue(ctr_result)
-        self.assertTrue((self.output_dir / "controls" / "TEST.json").exists())
-
-        # Test SND conversion
-        snd_result = convert_all(
+        expected_outputs = {
+            "ani": self.output_dir / "animations" / "TEST.json",
+            "ctr": self.output_dir / "controls" / "TEST.json",
+            "snd": self.output_dir / "sounds" / "TEST.wav",
+            "text": self.output_dir / "text" / "TEST.txt",
+        }
+
+        # One directory walk dispatches each file to its converter
+        result = convert_all(
             input_dir=str(self.input_dir),
             output_dir=str(self.output_dir),
-            file_type="snd",
             clean=False,
+            file_types=list(expected_outputs),
         )
-        self.assertTrue(snd_result)
-        self.assertTrue((self.output_dir / "sounds" / "TEST.wav").exists())
+        self.assertTrue(result)
 
-        # Test TXT conversion
-        txt_result = convert_all(
-            input_dir=str(self.input_dir),
-            output_dir=str(self.output_dir),
-            file_type="text",
-            clean=False,
-        )
-        self.assertTrue(txt_result)
-        self.assertTrue((self.output_dir / "text" / "TEST.txt").exists())
+        for output_path in expected_outputs.values():
+            self.assertTrue(output_path.exists(), f"{output_path} not created")
 
     def test_convert_all_file_types(self):
         """Test converting all file types at once"""
@@ -251,7 +183,7 @@ class ConversionPipelineTest(unittest.TestCase):
         # Run the CLI with subprocess - no type defaults to processing all files
         cmd = [
             sys.executable,
-            str(Path(parent_dir) / "main.py"),
+            str(PROJECT_ROOT / "main.py"),
             "convert",
             "--input",
             str(self.input_dir),
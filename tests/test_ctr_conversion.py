@@ -9,24 +9,21 @@ This module tests the CTR conversion functionality, including:
 - Element structure
 """
 
-import sys
+import io
 import json
 import unittest
-import tempfile
-import shutil
-from pathlib import Path
+from unittest import mock
 from tools.convert_ctr import (
+    MIN_PARALLEL_FILES,
     convert_ctr,
+    convert_ctr_batch,
+    convert_ctr_batch_jsonl,
     parse_ctr_file,
     parse_command,
     split_commands,
     clean_text,
 )
-
-# Add parent directory to path for imports
-parent_dir = str(Path(__file__).parent.parent)
-if parent_dir not in sys.path:
-    sys.path.append(parent_dir)
+from tests._fixtures import PROJECT_ROOT, SAMPLE_CTR_TEXT, list_raw, sample_files
 
 
 class CTRConverterTest(unittest.TestCase):
@@ -35,38 +32,15 @@ class CTRConverterTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up test resources"""
-        cls.temp_dir = Path(tempfile.mkdtemp())
-        cls.output_dir = cls.temp_dir / "output"
+        fixtures = sample_files()
+        cls.output_dir = fixtures.temp_dir / "ctr_output"
         cls.output_dir.mkdir(exist_ok=True)
 
         # Original CTR files directory
-        cls.raw_dir = Path(parent_dir) / "raw_extracted"
-
-        # Create a simple test CTR file
-        cls.test_ctr_file = cls.temp_dir / "TEST.CTR"
-        with open(cls.test_ctr_file, "w", encoding="ascii") as f:
-            f.write("17,let's load the images\n")
-            f.write("1,1\n")
-            f.write("OKAY.PCC\n")
-            f.write("17,icon buttons\n")
-            f.write("4,200 5,350\n")
-            f.write("6,135 7,120\n")
-            f.write("12,0,6\n")
-            f.write("6,215 7,290\n")
-            f.write("8,0,0,1,28\n")
-            f.write("6,315 7,290\n")
-            f.write("8,0,1,99,1\n")
-            f.write("6,135 7,120\n")
-            f.write("11,4,1,2\n")
-            f.write("6,135 7,120\n")
-            f.write("11,2,1,3\n")
-            f.write("6,135 7,120\n")
-            f.write("11,1,1,4\n")
+        cls.raw_dir = PROJECT_ROOT / "raw_extracted"
 
-    @classmethod
-    def tearDownClass(cls):
-        """Clean up resources"""
-        shutil.rmtree(cls.temp_dir)
+        # Shared test CTR file
+        cls.test_ctr_file = fixtures.ctr_path
 
     def test_parse_command(self):
         """Test parsing individual CTR commands"""
@@ -127,7 +101,9 @@ class CTRConverterTest(unittest.TestCase):
 
     def test_parse_ctr_file(self):
         """Test parsing a CTR file"""
-        data = parse_ctr_file(self.test_ctr_file)
+        stream = io.StringIO(SAMPLE_CTR_TEXT)
+        stream.name = "TEST.CTR"
+        data = parse_ctr_file(stream)
 
         # Check basic structure
         self.assertIn("metadata", data)
@@ -157,6 +133,22 @@ class CTRConverterTest(unittest.TestCase):
         self.assertEqual(panel["position"]["x"], 135)
         self.assertEqual(panel["position"]["y"], 120)
 
+    def test_parse_command_results_are_independent(self):
+        """Test that repeated parameters don't share parsed dicts"""
+        for cmd_str, key in [
+            ("8,0,0,1,28", "properties"),
+            ("12,0,6", "colors"),
+            ("18,1,0,0,15,1", "style"),
+        ]:
+            with self.subTest(cmd_str=cmd_str):
+                first = parse_command(cmd_str)
+                second = parse_command(cmd_str)
+                self.assertEqual(first, second)
+
+                first[key].clear()
+                self.assertNotEqual(second[key], {})
+                self.assertEqual(parse_command(cmd_str), second)
+
     def test_convert_ctr_file(self):
         """Test converting a CTR file to JSON"""
         result = convert_ctr(self.test_ctr_file, self.output_dir)
@@ -174,31 +166,79 @@ class CTRConverterTest(unittest.TestCase):
         self.assertIn("ui_elements", json_data)
         self.assertEqual(json_data["filename"], "TEST.CTR")
 
-    def test_convert_real_ctr_file(self):
-        """Test converting a real CTR file if available"""
-        # Try to find a real CTR file
-        real_ctr_files = list(self.raw_dir.glob("*.CTR"))
+    def test_convert_ctr_batch(self):
+        """Test converting a small batch of CTR files inline"""
+        output_dir = self.output_dir / "batch"
+        not_ctr = self.test_ctr_file.with_name("TEST.ANI")
+        with mock.patch("tools.convert_ctr.ProcessPoolExecutor") as executor:
+            results = convert_ctr_batch([self.test_ctr_file, not_ctr], output_dir)
+        self.assertEqual(results, [True, False])
+        executor.assert_not_called()
 
+        with open(output_dir / "controls" / "TEST.json", "r", encoding="utf-8") as f:
+            json_data = json.load(f)
+        self.assertEqual(json_data["filename"], "TEST.CTR")
+
+    def test_convert_ctr_batch_parallel(self):
+        """Test a batch large enough to use the process pool"""
+        input_dir = self.output_dir / "batch_input"
+        input_dir.mkdir(exist_ok=True)
+        filepaths = []
+        for i in range(MIN_PARALLEL_FILES):
+            filepath = input_dir / f"TEST{i}.CTR"
+            filepath.write_text(SAMPLE_CTR_TEXT, encoding="ascii")
+            filepaths.append(filepath)
+
+        output_dir = self.output_dir / "batch_parallel"
+        results = convert_ctr_batch(filepaths, output_dir)
+        self.assertEqual(results, [True] * MIN_PARALLEL_FILES)
+        for filepath in filepaths:
+            output_path = output_dir / "controls" / f"{filepath.stem}.json"
+            self.assertTrue(output_path.exists())
+
+        # Everything is converted now, so nothing is submitted to a pool
+        with mock.patch("tools.convert_ctr.ProcessPoolExecutor") as executor:
+            results = convert_ctr_batch(filepaths, output_dir)
+        self.assertEqual(results, [True] * MIN_PARALLEL_FILES)
+        executor.assert_not_called()
+
+    def test_convert_ctr_batch_jsonl(self):
+        """Test converting several CTR files into one JSON Lines file"""
+        output_path = self.output_dir / "batch.jsonl"
+        not_ctr = self.test_ctr_file.with_name("TEST.ANI")
+        written = convert_ctr_batch_jsonl(
+            [self.test_ctr_file, not_ctr, self.test_ctr_file], output_path
+        )
+        self.assertEqual(written, 2)
+
+        records = output_path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(records), 2)
+        for record in records:
+            self.assertEqual(json.loads(record), parse_ctr_file(self.test_ctr_file))
+
+    def test_convert_real_ctr_files(self):
+        """Test converting each real CTR file from raw_extracted"""
+        real_ctr_files = list_raw(".CTR")
         if not real_ctr_files:
             self.skipTest("No real CTR files found to test")
 
-        # Test with first found CTR file
-        ctr_file = real_ctr_files[0]
-        result = convert_ctr(ctr_file, self.output_dir)
-        self.assertTrue(result)
-
-        # Check if the output file exists
-        output_path = self.output_dir / "controls" / f"{ctr_file.stem}.json"
-        self.assertTrue(output_path.exists())
+        for ctr_file in real_ctr_files:
+            with self.subTest(ctr_file=ctr_file.name):
+                # Each file gets its own output directory
+                output_dir = self.output_dir / "real" / ctr_file.name
+                self.assertTrue(convert_ctr(ctr_file, output_dir))
 
-        # Verify JSON structure
-        with open(output_path, "r", encoding="utf-8") as f:
-            json_data = json.load(f)
+                # Check if the output file exists
+                output_path = output_dir / "controls" / f"{ctr_file.stem}.json"
+                self.assertTrue(output_path.exists())
 
-        self.assertIn("metadata", json_data)
-        self.assertIn("ui_elements", json_data)
-        self.assertEqual(json_data["filename"], f"{ctr_file.name}")
+                # Verify JSON structure
+                with open(output_path, "r", encoding="utf-8") as f:
+                    json_data = json.load(f)
 
+                self.assertIn("metadata", json_data)
+                self.assertIn("ui_elements", json_data)
+                self.assertEqual(json_data["filename"], ctr_file.name)
 
 if __name__ == "__main__":
     unittest.main()
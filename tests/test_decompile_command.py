@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process `main.py decompile` command.
+
+The decompiler's own main() is patched out, so these tests only cover how
+main.decompile_executable drives it: argv, exit codes and logging state.
+"""
+
+import logging
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from tests._fixtures import scratch_directory
+
+
+def _decompile_args(file, output, **overrides):
+    """Build the argparse namespace main.py passes to decompile_executable"""
+    args = SimpleNamespace(
+        file=str(file),
+        output=str(output),
+        no_enhanced=False,
+        no_data_flow=False,
+        no_improved=False,
+        no_c_code=False,
+        no_all_analyzers=False,
+        visualize=False,
+        resource_dir=None,
+        debug=False,
+    )
+    for name, value in overrides.items():
+        setattr(args, name, value)
+    return args
+
+
+class DecompileCommandTest(unittest.TestCase):
+    """Test main.decompile_executable running the decompiler in-process"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Import main without letting it keep its root logging config"""
+        root_logger = logging.getLogger()
+        saved_handlers = root_logger.handlers[:]
+        saved_level = root_logger.level
+        try:
+            import main
+        finally:
+            root_logger.handlers[:] = saved_handlers
+            root_logger.setLevel(saved_level)
+        cls.main = main
+
+        cls._tmp = scratch_directory()
+        cls.temp_dir = Path(cls._tmp.name)
+        cls.exe_path = cls.temp_dir / "TEST.EXE"
+        cls.exe_path.write_bytes(b"MZ")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up resources"""
+        cls._tmp.cleanup()
+
+    def _run(self, decompiler_main, **overrides):
+        """Run decompile_executable with tools.decompiler.main.main patched
+
+        Returns:
+            list: The messages main.py logged at ERROR level
+        """
+        args = _decompile_args(self.exe_path, self.temp_dir / "out", **overrides)
+        with mock.patch(
+            "tools.decompiler.main.main", side_effect=decompiler_main
+        ), mock.patch.object(self.main.logger, "error") as log_error:
+            self.main.decompile_executable(args)
+        return [call.args[0] for call in log_error.call_args_list]
+
+    def test_passes_default_options_as_argv(self):
+        """The decompiler sees the default options on sys.argv"""
+        seen = []
+        saved_argv = sys.argv
+
+        def decompiler_main():
+            seen.extend(sys.argv)
+            return 0
+
+        self.assertEqual(self._run(decompiler_main), [])
+        self.assertEqual(
+            seen,
+            [
+                "tools.decompiler.main",
+                str(self.exe_path),
+                "--output",
+                str(self.temp_dir / "out"),
+                "--enhanced",
+                "--data-flow",
+                "--improved",
+                "--c-code",
+                "--all-analyzers",
+            ],
+        )
+        self.assertIs(sys.argv, saved_argv)
+
+    def test_exit_codes(self):
+        """SystemExit codes are reported the way the interpreter would"""
+        cases = [
+            (None, None),
+            (0, None),
+            (2, 2),
+            ("bad arguments", 1),
+        ]
+        for code, expected in cases:
+            with self.subTest(code=code):
+
+                def decompiler_main():
+                    raise SystemExit(code)
+
+                errors = self._run(decompiler_main)
+                if expected is None:
+                    self.assertEqual(errors, [])
+                else:
+                    self.assertEqual(
+                        errors,
+                        [f"Decompiler failed with return code {expected}"],
+                    )
+
+    def test_restores_root_logging(self):
+        """Root logging reconfigured by the decompiler is put back"""
+        root_logger = logging.getLogger()
+        saved_handlers = root_logger.handlers[:]
+        saved_level = root_logger.level
+
+        def decompiler_main():
+            logging.basicConfig(level=logging.DEBUG, force=True)
+            return 0
+
+        self._run(decompiler_main)
+        self.assertEqual(root_logger.handlers, saved_handlers)
+        self.assertEqual(root_logger.level, saved_level)
+
+
+if __name__ == "__main__":
+    unittest.main()
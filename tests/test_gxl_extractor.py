@@ -9,17 +9,10 @@ This module tests the GXL archive extraction functionality, including:
 - Error handling
 """
 
-import sys
+import os
 import unittest
-import tempfile
-import shutil
-from pathlib import Path
 from tools.gxl_extractor import GXLExtractor
-
-# Add parent directory to path for imports
-parent_dir = str(Path(__file__).parent.parent)
-if parent_dir not in sys.path:
-    sys.path.append(parent_dir)
+from tests._fixtures import PROJECT_ROOT, sample_files
 
 
 class GXLExtractorTest(unittest.TestCase):
@@ -28,28 +21,30 @@ class GXLExtractorTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up test resources"""
-        cls.temp_dir = Path(tempfile.mkdtemp())
+        cls.temp_dir = sample_files().temp_dir / "gxl"
         cls.output_dir = cls.temp_dir / "extracted"
-        cls.output_dir.mkdir(exist_ok=True)
 
         # Original GXL file
-        cls.gxl_file = Path(parent_dir) / "original_game" / "OREGON.GXL"
+        cls.gxl_file = PROJECT_ROOT / "original_game" / "OREGON.GXL"
 
         # Try alternate locations if not found
         if not cls.gxl_file.exists():
             alternate_locations = [
-                Path(parent_dir) / "OREGON.GXL",
-                Path(parent_dir).parent / "OREGON.GXL",
+                PROJECT_ROOT / "OREGON.GXL",
+                PROJECT_ROOT.parent / "OREGON.GXL",
             ]
             for alt in alternate_locations:
                 if alt.exists():
                     cls.gxl_file = alt
                     break
 
-    @classmethod
-    def tearDownClass(cls):
-        """Clean up resources"""
-        shutil.rmtree(cls.temp_dir)
+        # Parse, analyze and extract the archive once for the whole class
+        if cls.gxl_file.exists():
+            cls.extractor = GXLExtractor(cls.gxl_file)
+            cls.info = cls.extractor.analyze()
+            cls.extract_result = cls.extractor.extract_all_files(
+                cls.output_dir, verify_integrity=True
+            )
 
     def setUp(self):
         """Set up each test"""
@@ -58,8 +53,7 @@ class GXLExtractorTest(unittest.TestCase):
 
     def test_archive_analysis(self):
         """Test GXL archive analysis"""
-        extractor = GXLExtractor(self.gxl_file)
-        info = extractor.analyze()
+        info = self.info
 
         # Verify basic archive information
         self.assertIsNotNone(info)
@@ -83,14 +77,14 @@ class GXLExtractorTest(unittest.TestCase):
         self.assertIn("complete", info["completeness"])
         self.assertIn("unaccounted_bytes", info["completeness"])
         self.assertIn("unaccounted_percentage", info["completeness"])
+        self.assertEqual(
+            info["completeness"]["data_size"],
+            sum(entry["size"] for entry in info["entries"]),
+        )
 
     def test_file_extraction(self):
         """Test extracting files from GXL archive"""
-        extractor = GXLExtractor(self.gxl_file)
-
-        # Extract all files
-        result = extractor.extract_all_files(self.output_dir)
-        self.assertTrue(result)
+        self.assertTrue(self.extract_result)
 
         # Verify some known files exist
         expected_files = ["BANKS.PC8", "DEATH.XMI", "BEEP.SND", "GUIDE.CTR"]
@@ -104,29 +98,22 @@ class GXLExtractorTest(unittest.TestCase):
 
     def test_integrity_verification(self):
         """Test file integrity verification during extraction"""
-        extractor = GXLExtractor(self.gxl_file)
-
-        # Extract with integrity verification
-        result = extractor.extract_all_files(self.output_dir, verify_integrity=True)
-        self.assertTrue(result)
-
-        # Get archive analysis
-        info = extractor.analyze()
+        # setUpClass extracted with integrity verification enabled
+        self.assertTrue(self.extract_result)
 
         # Verify extracted file count matches archive entry count
-        extracted_count = sum(1 for _ in self.output_dir.glob("*"))
-        self.assertEqual(extracted_count, info["num_entries"])
+        extracted_count = len(os.listdir(self.output_dir))
+        self.assertEqual(extracted_count, self.info["num_entries"])
 
     def test_extraction_to_nonexistent_directory(self):
         """Test extraction to a directory that doesn't exist"""
-        extractor = GXLExtractor(self.gxl_file)
         output_dir = self.temp_dir / "nonexistent"
 
         # Should create directory and extract successfully
-        result = extractor.extract_all_files(output_dir)
+        result = self.extractor.extract_all_files(output_dir)
         self.assertTrue(result)
         self.assertTrue(output_dir.exists())
-        self.assertGreater(sum(1 for _ in output_dir.glob("*")), 0)
+        self.assertGreater(len(os.listdir(output_dir)), 0)
 
 
 if __name__ == "__main__":
@@ -6,21 +6,26 @@ This module tests the integration between GXL extraction and PC8/PC4 conversion,
 ensuring the entire pipeline produces consistent results (byte-for-byte identical).
 """
 
-import sys
+import logging
+import os
 import unittest
-import hashlib
-import tempfile
-import shutil
-import subprocess
+import filecmp
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from PIL import Image, ImageChops
+from types import SimpleNamespace
+from PIL import Image
 from tools.convert_pc8 import convert_image
-from tools.pcx_utils import setup_logging
+from tests._fixtures import (
+    PROJECT_ROOT,
+    list_nonempty,
+    scratch_directory,
+    setup_pcx_logging,
+    sha256_file,
+)
 
-# Add parent directory to path for imports
-parent_dir = str(Path(__file__).parent.parent)
-if parent_dir not in sys.path:
-    sys.path.append(parent_dir)
+# Make sure logging is set up (once per test process)
+setup_pcx_logging()
 
 
 class GxlPc8PipelineTest(unittest.TestCase):
@@ -30,23 +35,28 @@ class GxlPc8PipelineTest(unittest.TestCase):
     def setUpClass(cls):
         """Set up common test resources"""
         # Create temp directories for test outputs
-        cls.temp_dir = Path(tempfile.mkdtemp())
+        cls._tmp = scratch_directory()
+        cls.temp_dir = Path(cls._tmp.name)
         cls.extracted_dir = cls.temp_dir / "extracted"
         cls.extracted_dir.mkdir(exist_ok=True)
         cls.converted_dir = cls.temp_dir / "converted"
         cls.converted_dir.mkdir(exist_ok=True)
 
+        # Converted PNGs keyed by source content, shared by the tests
+        cls._convert_cache = {}
+        cls._convert_locks = {}
+
         # Reference images directory (current images in modern/images)
-        cls.reference_dir = Path(parent_dir) / "modern" / "images"
+        cls.reference_dir = PROJECT_ROOT / "modern" / "images"
 
         # Original GXL file (if available)
-        cls.gxl_file = Path(parent_dir) / "original_game" / "OREGON.GXL"
+        cls.gxl_file = PROJECT_ROOT / "original_game" / "OREGON.GXL"
 
         # If GXL file not found in expected location, try alternate locations
         if not cls.gxl_file.exists():
             alternate_locations = [
-                Path(parent_dir) / "OREGON.GXL",
-                Path(parent_dir).parent / "OREGON.GXL",
+                PROJECT_ROOT / "OREGON.GXL",
+                PROJECT_ROOT.parent / "OREGON.GXL",
             ]
             for alt in alternate_locations:
                 if alt.exists():
@@ -59,23 +69,58 @@ class GxlPc8PipelineTest(unittest.TestCase):
             # Add more test cases here as needed
         ]
 
-        # Make sure logging is set up
-        setup_logging(False)
+        # Reference digests written by ReferenceImageTracker, when present,
+        # save reading the reference images themselves
+        try:
+            from tests.reference_image_manifest import REFERENCE_IMAGES
+        except ImportError:
+            REFERENCE_IMAGES = {}
+        cls._ref_hashes = {
+            path: info["hash"] for path, info in REFERENCE_IMAGES.items()
+        }
+
+        # Extract the GXL file once with main.py for every test in the class
+        cls._extracted = {}
+        cls._extract_error = None
+        if cls.gxl_file.exists():
+            # Run the extract command in-process rather than in a fresh
+            # interpreter. main configures root logging on import, so it is
+            # only loaded when there is an archive to extract, and the
+            # caller's logging config is put back afterwards.
+            root_logger = logging.getLogger()
+            saved_handlers = root_logger.handlers[:]
+            saved_level = root_logger.level
+            try:
+                import main
+            finally:
+                root_logger.handlers[:] = saved_handlers
+                root_logger.setLevel(saved_level)
+
+            try:
+                main.extract_gxl(
+                    SimpleNamespace(
+                        files=[str(cls.gxl_file)],
+                        output=str(cls.extracted_dir),
+                        analyze=False,
+                        debug=False,
+                        format="text",
+                        no_verify=False,
+                        # Don't leave an analysis cache behind
+                        no_cache=True,
+                    )
+                )
+            except Exception as e:
+                cls._extract_error = str(e)
+            else:
+                cls._extracted = {
+                    path.name: path for path in cls.extracted_dir.iterdir()
+                }
 
     @classmethod
     def tearDownClass(cls):
         """Clean up resources"""
         # Remove temp directory
-        shutil.rmtree(cls.temp_dir)
-
-    def get_file_hash(self, filepath):
-        """Calculate SHA-256 hash of a file for comparison"""
-        hash_obj = hashlib.sha256()
-        with open(filepath, "rb") as f:
-            # Read and update hash in chunks for memory efficiency
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_obj.update(chunk)
-        return hash_obj.hexdigest()
+        cls._tmp.cleanup()
 
     def compare_images(self, img1_path, img2_path):
         """Compare two images for pixel-perfect equality"""
@@ -86,20 +131,99 @@ class GxlPc8PipelineTest(unittest.TestCase):
             # Check mode (color mode)
             self.assertEqual(img1.mode, img2.mode, "Image color modes don't match")
 
-            # Check for pixel differences
-            diff = ImageChops.difference(img1, img2)
-            # If images are identical, the difference will be completely black
-            self.assertEqual(diff.getbbox(), None, "Images have pixel differences")
+            # Palette images compare their palettes and index data directly
+            # rather than being expanded to RGB
+            self.assertEqual(
+                img1.getpalette(), img2.getpalette(), "Image palettes don't match"
+            )
+
+            # Compare the raw pixel buffers in a single pass
+            self.assertTrue(
+                img1.tobytes() == img2.tobytes(), "Images have pixel differences"
+            )
+
+    def _run_per_image(self, check, images):
+        """Run check(image) for each image on a thread pool
+
+        Failures and skips raised by a worker are re-raised in the test.
+        """
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = [executor.submit(check, image) for image in images]
+            for future in futures:
+                future.result()
+
+    @classmethod
+    def _convert_once(cls, source_path):
+        """Convert a PC8/PC4 file, reusing any earlier conversion of the same bytes
+
+        The raw_extracted copy and the freshly extracted copy of an image
+        are identical, so the tests only decode it once.
+
+        Returns:
+            Path: Converted PNG (which may not exist if conversion failed)
+        """
+        key = sha256_file(source_path)
+        with cls._convert_locks.setdefault(key, threading.Lock()):
+            if key not in cls._convert_cache:
+                output_dir = cls.converted_dir / key
+                convert_image(source_path, output_dir)
+                ext = source_path.suffix.lower().lstrip(".")
+                cls._convert_cache[key] = (
+                    output_dir / "images" / ext / f"{source_path.stem}.png"
+                )
+            return cls._convert_cache[key]
+
+    def _convert_and_compare(self, source_path, ref_path):
+        """Convert one image and check it matches its reference byte-for-byte
+
+        Args:
+            source_path: PC8/PC4 file to convert
+            ref_path: Reference image path relative to reference_dir
+                (e.g. pc8/CLIFFS.png)
+        """
+        ref_image_path = self.reference_dir / ref_path
+
+        # Convert the image (or reuse an earlier conversion of it)
+        converted_image_path = self._convert_once(source_path)
+
+        # Verify the converted image exists
+        self.assertTrue(
+            converted_image_path.exists(),
+            f"Conversion failed to produce {ref_path}",
+        )
+
+        expected_hash = self._ref_hashes.get(ref_path)
+        if expected_hash is not None:
+            self.assertEqual(
+                sha256_file(converted_image_path),
+                expected_hash,
+                f"Converted image {ref_path} differs from reference",
+            )
+            return
+
+        # A size mismatch fails without reading either file
+        self.assertEqual(
+            ref_image_path.stat().st_size,
+            converted_image_path.stat().st_size,
+            f"Converted image {ref_path} size differs from reference",
+        )
+
+        # Compare bytes for byte-for-byte equality
+        if not filecmp.cmp(ref_image_path, converted_image_path, shallow=False):
+            # Report pixel-level differences before failing on the bytes
+            self.compare_images(ref_image_path, converted_image_path)
+            self.fail(f"Converted image {ref_path} differs from reference")
 
     def test_pipeline_with_existing_extracted_files(self):
         """Test PC8 conversion with already extracted files"""
-        for source_filename in self.test_images:
+
+        def check(source_filename):
             # Extract filename without extension
             base_name = Path(source_filename).stem
             ext = Path(source_filename).suffix.lower().lstrip(".")
 
             # Source path in raw_extracted
-            source_path = Path(parent_dir) / "raw_extracted" / source_filename
+            source_path = PROJECT_ROOT / "raw_extracted" / source_filename
 
             # Reference image path (e.g., modern/images/pc8/CLIFFS.png)
             ref_path = f"{ext}/{base_name}.png"
@@ -109,37 +233,13 @@ class GxlPc8PipelineTest(unittest.TestCase):
             if not source_path.exists():
                 self.skipTest(f"Source file {source_path} not found")
 
-            # Skip if reference image doesn't exist
-            if not ref_image_path.exists():
+            # Skip if there is neither a reference digest nor a reference image
+            if ref_path not in self._ref_hashes and not ref_image_path.exists():
                 self.skipTest(f"Reference image {ref_image_path} not found")
 
-            # Get reference image hash
-            ref_hash = self.get_file_hash(ref_image_path)
-
-            # Convert the PC8 file
-            convert_image(source_path, self.converted_dir)
-
-            # Get path to converted image
-            converted_image_path = self.converted_dir / "images" / ref_path
-
-            # Verify the converted image exists
-            self.assertTrue(
-                converted_image_path.exists(),
-                f"Conversion failed to produce {ref_path}",
-            )
-
-            # Get converted image hash
-            converted_hash = self.get_file_hash(converted_image_path)
-
-            # Compare hashes for byte-for-byte equality
-            self.assertEqual(
-                ref_hash,
-                converted_hash,
-                f"Converted image {ref_path} differs from reference",
-            )
+            self._convert_and_compare(source_path, ref_path)
 
-            # Also do a pixel-by-pixel comparison
-            self.compare_images(ref_image_path, converted_image_path)
+        self._run_per_image(check, self.test_images)
 
     def test_full_pipeline_extraction_and_conversion(self):
         """Test the full pipeline from GXL extraction to PC8 conversion"""
@@ -147,91 +247,38 @@ class GxlPc8PipelineTest(unittest.TestCase):
         if not self.gxl_file.exists():
             self.skipTest(f"Original GXL file not found at {self.gxl_file}")
 
+        if self._extract_error is not None:
+            self.fail(f"GXL extraction failed: {self._extract_error}")
+        if not self._extracted:
+            self.skipTest("GXL extraction did not run or produced no files")
+
         # Test images to verify
         img_exts = [".pc8", ".pc4"]  # Fixed comma between extensions
         test_imgs = [
             img for img in self.test_images if Path(img).suffix.lower() in img_exts
         ]
 
-        # Extract GXL file using main.py
-        main_script = Path(parent_dir) / "main.py"
-        if not main_script.exists():
-            self.skipTest(f"Main script not found at {main_script}")
-
-        try:
-            # Run GXL extraction
-            subprocess.run(
-                [
-                    sys.executable,
-                    str(main_script),
-                    "extract",
-                    str(self.gxl_file),
-                    "--output",
-                    str(self.extracted_dir),
-                ],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-
-            # Check if extraction produced our test files
-            missing_files = []
-            for img in test_imgs:
-                if not (self.extracted_dir / img).exists():
-                    missing_files.append(img)
-
-            if missing_files:
-                self.skipTest(f"Extraction didn't produce these files: {missing_files}")
+        # Check if extraction produced our test files
+        missing_files = [img for img in test_imgs if img not in self._extracted]
+        if missing_files:
+            self.skipTest(f"Extraction didn't produce these files: {missing_files}")
 
-            # Now convert the extracted files
-            for img in test_imgs:
-                base_name = Path(img).stem
-                ext = Path(img).suffix.lower().lstrip(".")
+        # Now convert the extracted files
+        def check(img):
+            base_name = Path(img).stem
+            ext = Path(img).suffix.lower().lstrip(".")
 
-                # Extract file to convert
-                extract_path = self.extracted_dir / img
-
-                # Reference image path
-                ref_path = f"{ext}/{base_name}.png"
-                ref_image_path = self.reference_dir / ref_path
-
-                # Skip if reference image doesn't exist
-                if not ref_image_path.exists():
-                    continue
-
-                # Get reference image hash
-                ref_hash = self.get_file_hash(ref_image_path)
-
-                # Convert the image
-                convert_image(extract_path, self.converted_dir)
-
-                # Get path to converted image
-                converted_image_path = self.converted_dir / "images" / ref_path
-
-                # Verify the converted image exists
-                self.assertTrue(
-                    converted_image_path.exists(),
-                    f"Conversion failed to produce {ref_path}",
-                )
-
-                # Get converted image hash
-                converted_hash = self.get_file_hash(converted_image_path)
-
-                # Compare hashes for byte-for-byte equality
-                self.assertEqual(
-                    ref_hash,
-                    converted_hash,
-                    f"Converted image {ref_path} differs from reference",
-                )
+            # Reference image path
+            ref_path = f"{ext}/{base_name}.png"
 
-                # Also do a pixel-by-pixel comparison
-                self.compare_images(ref_image_path, converted_image_path)
+            # Skip if there is neither a reference digest nor a reference image
+            if ref_path not in self._ref_hashes:
+                if not (self.reference_dir / ref_path).exists():
+                    return
 
-        except subprocess.CalledProcessError as e:
-            self.fail(f"GXL extraction failed: {e.stderr}")
+            self._convert_and_compare(self._extracted[img], ref_path)
 
-        except Exception as e:
-            self.fail(f"Test failed: {str(e)}")
+        self._run_per_image(check, test_imgs)
 
 
 class ReferenceImageTracker(unittest.TestCase):
@@ -242,63 +289,63 @@ class ReferenceImageTracker(unittest.TestCase):
         # Skip by default - only run manually
         self.skipTest("This test is only for manual execution")
 
-        images_dir = Path(parent_dir) / "modern" / "images"
+        images_dir = PROJECT_ROOT / "modern" / "images"
 
         # Output file for image manifest
-        output_file = Path(parent_dir) / "tests" / "reference_image_manifest.py"
-
-        image_info = {}
-
-        # Process all image subdirectories
-        for image_type in ["pc8", "pc4"]:
-            type_dir = images_dir / image_type
-            if not type_dir.exists():
-                continue
-
-            for img_path in type_dir.glob("*.png"):
-                # Calculate hash
-                hash_obj = hashlib.sha256()
-                with open(img_path, "rb") as f:
-                    for chunk in iter(lambda: f.read(4096), b""):
-                        hash_obj.update(chunk)
-
-                # Get image dimensions and mode
-                with Image.open(img_path) as img:
-                    width, height = img.size
-                    mode = img.mode
-
-                # Store info
-                image_key = f"{image_type}/{img_path.name}"
-                image_info[image_key] = {
-                    "hash": hash_obj.hexdigest(),
-                    "width": width,
-                    "height": height,
-                    "mode": mode,
-                    "source": f"{img_path.stem.upper()}.{image_type.upper()}",
-                }
-
-        # Generate Python file with image manifest
-        with open(output_file, "w") as f:
-            f.write("#!/usr/bin/env python3\n")
-            f.write('"""\n')
-            f.write("Reference image manifest for regression testing.\n")
-            f.write("\n")
-            f.write(
-                "This file contains metadata about reference images used in testing,\n"
-            )
-            f.write("including SHA-256 hashes, dimensions, and color modes.\n")
-            f.write('"""\n\n')
-            f.write("# Generated by ReferenceImageTracker\n\n")
-            f.write("REFERENCE_IMAGES = {\n")
-            for path, info in sorted(image_info.items()):
-                f.write(f'    "{path}": {{\n')
-                f.write(f'        "hash": "{info["hash"]}",\n')
-                f.write(f'        "width": {info["width"]},\n')
-                f.write(f'        "height": {info["height"]},\n')
-                f.write(f'        "mode": "{info["mode"]}",\n')
-                f.write(f'        "source": "{info["source"]}"\n')
-                f.write("    },\n")
-            f.write("}\n")
+        output_file = PROJECT_ROOT / "tests" / "reference_image_manifest.py"
+
+        # Process all image subdirectories, skipping empty files
+        img_paths = {
+            f"{image_type}/{img_path.name}": img_path
+            for image_type in ["pc8", "pc4"]
+            for img_path in list_nonempty(images_dir / image_type, ".png")
+        }
+
+        def describe(image_key):
+            image_type = image_key.split("/", 1)[0]
+            img_path = img_paths[image_key]
+
+            # Get image dimensions and mode
+            with Image.open(img_path) as img:
+                width, height = img.size
+                mode = img.mode
+
+            return {
+                "hash": sha256_file(img_path),
+                "width": width,
+                "height": height,
+                "mode": mode,
+                "source": f"{img_path.stem.upper()}.{image_type.upper()}",
+            }
+
+        # Hashing and header reads release the GIL, so describe images in parallel
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            image_info = dict(zip(img_paths, executor.map(describe, img_paths)))
+
+        # Generate Python file with image manifest in a single write
+        entries = "".join(
+            f'    "{path}": {{\n'
+            f'        "hash": "{info["hash"]}",\n'
+            f'        "width": {info["width"]},\n'
+            f'        "height": {info["height"]},\n'
+            f'        "mode": "{info["mode"]}",\n'
+            f'        "source": "{info["source"]}"\n'
+            "    },\n"
+            for path, info in sorted(image_info.items())
+        )
+        output_file.write_text(
+            "#!/usr/bin/env python3\n"
+            '"""\n'
+            "Reference image manifest for regression testing.\n"
+            "\n"
+            "This file contains metadata about reference images used in testing,\n"
+            "including SHA-256 hashes, dimensions, and color modes.\n"
+            '"""\n\n'
+            "# Generated by ReferenceImageTracker\n\n"
+            "REFERENCE_IMAGES = {\n"
+            f"{entries}"
+            "}\n"
+        )
 
 
 if __name__ == "__main__":
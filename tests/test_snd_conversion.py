@@ -7,19 +7,47 @@ This module tests the SND audio converter functionality, including:
 - Verifying WAV file properties
 """
 
-import sys
 import unittest
-import tempfile
-import shutil
 import wave
 import os
+import struct
 from pathlib import Path
 from tools.convert_snd import convert_snd
-
-# Add parent directory to path for imports
-parent_dir = str(Path(__file__).parent.parent)
-if parent_dir not in sys.path:
-    sys.path.append(parent_dir)
+from tests._fixtures import PROJECT_ROOT, list_raw, scratch_directory
+
+# Canonical 44-byte RIFF/WAVE header, as written by the wave module
+WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+
+def read_wav_header(path):
+    """Parse a canonical WAV header without building a wave reader
+
+    Args:
+        path: Path to a WAV file with a single fmt and data chunk
+
+    Returns:
+        tuple: (channels, sample width in bytes, frame rate, frame count)
+    """
+    with open(path, "rb") as f:
+        header = f.read(WAV_HEADER.size)
+    (
+        riff,
+        _riff_size,
+        wave_tag,
+        fmt_tag,
+        _fmt_size,
+        _audio_format,
+        channels,
+        frame_rate,
+        _byte_rate,
+        block_align,
+        bits_per_sample,
+        data_tag,
+        data_size,
+    ) = WAV_HEADER.unpack(header)
+    if (riff, wave_tag, fmt_tag, data_tag) != (b"RIFF", b"WAVE", b"fmt ", b"data"):
+        raise ValueError(f"{path} does not have a canonical WAV header")
+    return channels, bits_per_sample // 8, frame_rate, data_size // block_align
 
 
 class SNDConverterTest(unittest.TestCase):
@@ -28,23 +56,23 @@ class SNDConverterTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up test resources"""
-        cls.temp_dir = Path(tempfile.mkdtemp())
+        cls._tmp = scratch_directory()
+        cls.temp_dir = Path(cls._tmp.name)
         cls.output_dir = cls.temp_dir / "output"
         cls.output_dir.mkdir(exist_ok=True)
 
         # Original SND files directory
-        cls.raw_dir = Path(parent_dir) / "raw_extracted"
+        cls.raw_dir = PROJECT_ROOT / "raw_extracted"
 
         # Create a test SND file with synthetic audio data
         cls.test_snd_file = cls.temp_dir / "TEST.SND"
-        with open(cls.test_snd_file, "wb") as f:
-            # Create 1 second of simple 8-bit sine wave (simplified)
-            f.write(bytes([128] * 11025))  # 1 second of silence
+        # 1 second of 8-bit silence (0x80 is the unsigned midpoint)
+        cls.test_snd_file.write_bytes(b"\x80" * 11025)
 
     @classmethod
     def tearDownClass(cls):
         """Clean up resources"""
-        shutil.rmtree(cls.temp_dir)
+        cls._tmp.cleanup()
 
     def test_convert_snd_file(self):
         """Test converting an SND file to WAV"""
@@ -65,7 +93,7 @@ class SNDConverterTest(unittest.TestCase):
     def test_convert_real_snd_file(self):
         """Test converting a real SND file if available"""
         # Try to find a real SND file
-        real_snd_files = list(self.raw_dir.glob("*.SND"))
+        real_snd_files = list(list_raw(".SND"))
 
         if not real_snd_files:
             self.skipTest("No real SND files found to test")
@@ -79,16 +107,15 @@ class SNDConverterTest(unittest.TestCase):
         output_path = self.output_dir / "sounds" / f"{snd_file.stem}.wav"
         self.assertTrue(output_path.exists())
 
-        # Verify WAV file properties
-        with wave.open(str(output_path), "rb") as wav:
-            self.assertEqual(wav.getnchannels(), 1)  # Mono
-            self.assertEqual(wav.getsampwidth(), 1)  # 8-bit
-            self.assertEqual(wav.getframerate(), 11025)  # 11025 Hz
+        # Verify WAV file properties from the header alone; the wave module
+        # round-trip is covered by test_convert_snd_file
+        channels, sample_width, frame_rate, frames = read_wav_header(output_path)
+        self.assertEqual(channels, 1)  # Mono
+        self.assertEqual(sample_width, 1)  # 8-bit
+        self.assertEqual(frame_rate, 11025)  # 11025 Hz
 
-            # Get file size for verification
-            file_size = os.path.getsize(snd_file)
-            # WAV files have a 44-byte header, so frames should be file size - 44
-            self.assertEqual(wav.getnframes(), file_size)
+        # Each byte of the SND file becomes one 8-bit mono frame
+        self.assertEqual(frames, os.path.getsize(snd_file))
 
 
 if __name__ == "__main__":
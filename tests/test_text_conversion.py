@@ -7,18 +7,11 @@ This module tests the text conversion functionality, including:
 - Handling various text encoding scenarios
 """
 
-import sys
 import unittest
-import tempfile
-import shutil
 import os
 from pathlib import Path
 from tools.convert_text import convert_text
-
-# Add parent directory to path for imports
-parent_dir = str(Path(__file__).parent.parent)
-if parent_dir not in sys.path:
-    sys.path.append(parent_dir)
+from tests._fixtures import PROJECT_ROOT, list_raw, scratch_directory
 
 
 class TextConverterTest(unittest.TestCase):
@@ -27,29 +20,31 @@ class TextConverterTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up test resources"""
-        cls.temp_dir = Path(tempfile.mkdtemp())
+        cls._tmp = scratch_directory()
+        cls.temp_dir = Path(cls._tmp.name)
         cls.output_dir = cls.temp_dir / "output"
         cls.output_dir.mkdir(exist_ok=True)
 
         # Original text files directory
-        cls.raw_dir = Path(parent_dir) / "raw_extracted"
+        cls.raw_dir = PROJECT_ROOT / "raw_extracted"
 
         # Create a test text file
         cls.test_txt_file = cls.temp_dir / "TEST_PLAIN.TXT"
-        with open(cls.test_txt_file, "w", encoding="ascii") as f:
-            f.write("This is a test text file for Oregon Trail.\n")
-            f.write("It contains sample text for conversion testing.\n")
+        cls.test_txt_file.write_bytes(
+            b"This is a test text file for Oregon Trail.\n"
+            b"It contains sample text for conversion testing.\n"
+        )
 
         # Create a test CTR file (which is also text)
         cls.test_ctr_file = cls.temp_dir / "TEST.CTR"
-        with open(cls.test_ctr_file, "w", encoding="ascii") as f:
-            f.write("17,This is a comment\n")
-            f.write("10,This is some text content\n")
+        cls.test_ctr_file.write_bytes(
+            b"17,This is a comment\n10,This is some text content\n"
+        )
 
     @classmethod
     def tearDownClass(cls):
         """Clean up resources"""
-        shutil.rmtree(cls.temp_dir)
+        cls._tmp.cleanup()
 
     def test_convert_txt_file(self):
         """Test converting a TXT file to UTF-8"""
@@ -98,9 +93,7 @@ class TextConverterTest(unittest.TestCase):
     def test_convert_real_text_file(self):
         """Test converting a real text file if available"""
         # Try to find a real text file
-        real_txt_files = list(self.raw_dir.glob("*.TXT")) + list(
-            self.raw_dir.glob("*.CTR")
-        )
+        real_txt_files = list(list_raw(".TXT") + list_raw(".CTR"))
 
         if not real_txt_files:
             self.skipTest("No real text files found to test")
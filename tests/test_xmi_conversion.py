@@ -8,10 +8,7 @@ This module tests the XMI conversion functionality, including:
 - Duration and delay calculations
 """
 
-import sys
 import unittest
-import tempfile
-import shutil
 import os
 import struct
 from pathlib import Path
@@ -22,11 +19,12 @@ from tools.convert_xmi import (
     read_xmi_delay,
     read_xmi_duration,
 )
+from tests._fixtures import PROJECT_ROOT, list_raw, scratch_directory
 
-# Add parent directory to path for imports
-parent_dir = str(Path(__file__).parent.parent)
-if parent_dir not in sys.path:
-    sys.path.append(parent_dir)
+# Field layouts for the synthetic XMI file
+CHUNK_SIZE = struct.Struct(">L")  # IFF chunk sizes are big-endian
+COUNT = struct.Struct("<H")  # Song and instrument counts are little-endian
+PATCH = struct.Struct("BB")  # TIMB entry: patch, bank
 
 
 class XMIConverterTest(unittest.TestCase):
@@ -35,57 +33,58 @@ class XMIConverterTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up test resources"""
-        cls.temp_dir = Path(tempfile.mkdtemp())
+        cls._tmp = scratch_directory()
+        cls.temp_dir = Path(cls._tmp.name)
         cls.output_dir = cls.temp_dir / "output"
         cls.output_dir.mkdir(exist_ok=True)
 
         # Original XMI files directory
-        cls.raw_dir = Path(parent_dir) / "raw_extracted"
+        cls.raw_dir = PROJECT_ROOT / "raw_extracted"
 
         # Create a minimal synthetic XMI file for unit tests
         cls.test_xmi_file = cls.temp_dir / "TEST.XMI"
-        with open(cls.test_xmi_file, "wb") as f:
-            # FORM:XDIR header
-            f.write(b"FORM")
-            f.write(struct.pack(">L", 14))  # Size of XDIR chunk
-            f.write(b"XDIR")
-
-            # INFO chunk
-            f.write(b"INFO")
-            f.write(struct.pack(">L", 2))  # Size of INFO data
-            f.write(struct.pack("<H", 1))  # 1 song
-
-            # CAT:XMID header
-            f.write(b"CAT ")
-            f.write(struct.pack(">L", 60))  # Size of CAT chunk
-            f.write(b"XMID")
-
-            # FORM:XMID (song 1)
-            f.write(b"FORM")
-            f.write(struct.pack(">L", 44))  # Size of XMID chunk
-            f.write(b"XMID")
-
-            # TIMB chunk
-            f.write(b"TIMB")
-            f.write(struct.pack(">L", 4))  # Size of TIMB data
-            f.write(struct.pack("<H", 1))  # 1 instrument
-            f.write(struct.pack("BB", 0, 0))  # Piano
-
-            # EVNT chunk
-            f.write(b"EVNT")
-            f.write(struct.pack(">L", 12))  # Size of EVNT data
-
-            # Event data: Note On (channel 0, note 60, velocity 100, duration 24)
-            f.write(bytes([0, 0x90, 60, 100, 24]))
-            # Event data: End of track
-            f.write(bytes([0, 0xFF, 0x2F, 0x00]))
-            # Padding for 8-byte alignment
-            f.write(bytes([0, 0, 0]))
+        cls.test_xmi_file.write_bytes(
+            b"".join(
+                [
+                    # FORM:XDIR header
+                    b"FORM",
+                    CHUNK_SIZE.pack(14),  # Size of XDIR chunk
+                    b"XDIR",
+                    # INFO chunk
+                    b"INFO",
+                    CHUNK_SIZE.pack(2),  # Size of INFO data
+                    COUNT.pack(1),  # 1 song
+                    # CAT:XMID header
+                    b"CAT ",
+                    CHUNK_SIZE.pack(60),  # Size of CAT chunk
+                    b"XMID",
+                    # FORM:XMID (song 1)
+                    b"FORM",
+                    CHUNK_SIZE.pack(44),  # Size of XMID chunk
+                    b"XMID",
+                    # TIMB chunk
+                    b"TIMB",
+                    CHUNK_SIZE.pack(4),  # Size of TIMB data
+                    COUNT.pack(1),  # 1 instrument
+                    PATCH.pack(0, 0),  # Piano
+                    # EVNT chunk
+                    b"EVNT",
+                    CHUNK_SIZE.pack(12),  # Size of EVNT data
+                    # Event data: Note On (channel 0, note 60, velocity 100,
+                    # duration 24)
+                    bytes([0, 0x90, 60, 100, 24]),
+                    # Event data: End of track
+                    bytes([0, 0xFF, 0x2F, 0x00]),
+                    # Padding for 8-byte alignment
+                    bytes([0, 0, 0]),
+                ]
+            )
+        )
 
     @classmethod
     def tearDownClass(cls):
         """Clean up resources"""
-        shutil.rmtree(cls.temp_dir)
+        cls._tmp.cleanup()
 
     def test_write_variable_length(self):
         """Test writing variable length values"""
@@ -158,7 +157,7 @@ class XMIConverterTest(unittest.TestCase):
     def test_convert_real_xmi_file(self):
         """Test converting a real XMI file if available"""
         # Try to find a real XMI file
-        real_xmi_files = list(self.raw_dir.glob("*.XMI"))
+        real_xmi_files = list(list_raw(".XMI"))
 
         if not real_xmi_files:
             self.skipTest("No real XMI files found to test")
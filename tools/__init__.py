@@ -2,9 +2,22 @@
 Oregon Trail file format converters.
 """
 
-from .convert_pc8 import convert_pc8_pc4
-from .convert_snd import convert_snd
-from .convert_text import convert_text
-from .convert_xmi import convert_xmi
+import importlib
+
+# Converters are loaded on first access so that importing a tools submodule
+# (e.g. tools.decompiler) doesn't pull in PIL and every codec
+_LAZY_EXPORTS = {
+    "convert_pc8_pc4": ".convert_pc8",
+    "convert_snd": ".convert_snd",
+    "convert_text": ".convert_text",
+    "convert_xmi": ".convert_xmi",
+}
 
 __all__ = ["convert_pc8_pc4", "convert_snd", "convert_text", "convert_xmi"]
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,8 +4,18 @@ Raw image format analyzer.
 Does a detailed byte-level analysis of image files without making format assumptions.
 """
 
+import mmap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import struct
+
+import numpy as np
+
+# Byte translation table for hex dumps: printable ASCII kept, the rest "."
+_PRINTABLE_ASCII = bytes(b if 32 <= b <= 126 else ord(".") for b in range(256))
+
+# Byte value ranges reported by analyze_value_ranges, and where each starts
+_RANGE_NAMES = ("0-31", "32-127", "128-191", "192-255")
+_RANGE_STARTS = (0, 32, 128, 192)
 
 
 def dump_bytes(data: bytes, offset: int = 0, width: int = 16) -> str:
@@ -16,9 +26,9 @@ def dump_bytes(data: bytes, offset: int = 0, width: int = 16) -> str:
     for i in range(0, len(data), width):
         chunk = data[i : i + width]
         # Hex values
-        hex_values = " ".join(f"{b:02x}" for b in chunk)
+        hex_values = chunk.hex(" ")
         # ASCII representation (printable chars only)
-        ascii_values = "".join(chr(b) if 32 <= b <= 126 else "." for b in chunk)
+        ascii_values = chunk.translate(_PRINTABLE_ASCII).decode("ascii")
         # Pad hex values for alignment
         hex_values = hex_values.ljust(width * 3)
         result.append(f"{offset + i:08x}  {hex_values}  |{ascii_values}|")
@@ -28,59 +38,70 @@ def dump_bytes(data: bytes, offset: int = 0, width: int = 16) -> str:
 def analyze_byte_patterns(data: bytes, min_length: int = 3) -> list[dict]:
     """
     Find repeating byte patterns in the data.
+
+    A pattern of length L at offset i repeats while each following L-byte
+    block equals it, i.e. while data[j] == data[j + L] for consecutive j.
+    Each length is therefore scanned once, measuring the run of matching
+    bytes that starts at every offset.
     """
-    patterns = []
-    for length in range(min_length, min(32, len(data))):
-        for i in range(len(data) - length):
-            pattern = data[i : i + length]
-            # Look for immediate repetitions
-            count = 1
-            pos = i + length
-            while pos + length <= len(data) and data[pos : pos + length] == pattern:
-                count += 1
-                pos += length
-            if count > 1:
-                patterns.append(
-                    {
-                        "offset": i,
-                        "length": length,
-                        "pattern": list(pattern),
-                        "count": count,
-                        "total_bytes": length * count,
-                    }
-                )
-    return sorted(patterns, key=lambda x: x["total_bytes"], reverse=True)[:10]
+    arr = np.frombuffer(data, dtype=np.uint8)
+    candidates = []
+    for length in range(min_length, min(32, len(arr))):
+        same = arr[:-length] == arr[length:]
+        positions = np.arange(same.size)
+
+        # Distance from each offset to the next mismatch
+        next_mismatch = np.where(same, same.size, positions)
+        run = np.minimum.accumulate(next_mismatch[::-1])[::-1] - positions
+
+        offsets = np.flatnonzero(run >= length)
+        if not offsets.size:
+            continue
+        counts = 1 + run[offsets] // length
+        totals = counts * length
+
+        # Only this length's ten largest can make the overall top ten
+        best = np.lexsort((offsets, -totals))[:10]
+        candidates.extend(
+            (-total, length, offset, count)
+            for total, offset, count in zip(
+                totals[best].tolist(), offsets[best].tolist(), counts[best].tolist()
+            )
+        )
+
+    # Largest first; ties keep the shorter pattern, then the earlier offset
+    candidates.sort()
+    return [
+        {
+            "offset": offset,
+            "length": length,
+            "pattern": list(data[offset : offset + length]),
+            "count": count,
+            "total_bytes": -neg_total,
+        }
+        for neg_total, length, offset, count in candidates[:10]
+    ]
 
 
 def analyze_value_ranges(data: bytes) -> dict:
     """
     Analyze the range and distribution of byte values.
     """
-    value_counts = {}
-    ranges = {
-        "0-31": 0,  # Control chars
-        "32-127": 0,  # ASCII printable
-        "128-191": 0,  # High ASCII
-        "192-255": 0,  # Potential RLE markers
-    }
-
-    for b in data:
-        value_counts[b] = value_counts.get(b, 0) + 1
-        if b < 32:
-            ranges["0-31"] += 1
-        elif b < 128:
-            ranges["32-127"] += 1
-        elif b < 192:
-            ranges["128-191"] += 1
-        else:
-            ranges["192-255"] += 1
-
-    # Find most common values
-    common_values = sorted([(v, k) for k, v in value_counts.items()], reverse=True)[:10]
+    # Histogram every byte value in one vectorized pass
+    value_counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+    # Control chars, ASCII printable, high ASCII, potential RLE markers
+    range_counts = np.add.reduceat(value_counts, _RANGE_STARTS).tolist()
+    ranges = dict(zip(_RANGE_NAMES, range_counts))
+
+    # Find most common values (ties go to the higher byte value)
+    present = np.flatnonzero(value_counts)
+    common_values = sorted(
+        zip(value_counts[present].tolist(), present.tolist()), reverse=True
+    )[:10]
 
     return {
         "ranges": ranges,
-        "unique_values": len(value_counts),
+        "unique_values": len(present),
         "most_common": [{"value": k, "count": v} for v, k in common_values],
     }
 
@@ -101,29 +122,101 @@ def find_potential_headers(data: bytes) -> list[dict]:
 
     for marker, desc in markers:
         pos = data.find(marker)
-        if pos >= 0:
+        while pos >= 0:
             headers.append({"offset": pos, "type": desc, "marker": list(marker)})
-
-    # Look for potential dimension fields (16-bit values in reasonable ranges)
-    for i in range(len(data) - 4):
-        try:
-            w = struct.unpack("<H", data[i : i + 2])[0]
-            h = struct.unpack("<H", data[i + 2 : i + 4])[0]
-            if 1 <= w <= 4096 and 1 <= h <= 4096:  # Reasonable image dimensions
-                headers.append(
-                    {
-                        "offset": i,
-                        "type": "Possible dimensions",
-                        "values": {"width": w, "height": h},
-                    }
-                )
-        except Exception as e:
-            print(f"Error analyzing potential header at offset {i}: {e}")
-            continue
+            pos = data.find(marker, pos + 1)
+
+    # Look for potential dimension fields (16-bit values in reasonable ranges):
+    # read the little-endian word at every byte offset in one pass
+    arr = np.frombuffer(data, dtype=np.uint8).astype(np.uint16)
+    words = arr[:-1] | (arr[1:] << 8)
+    num_offsets = max(len(data) - 4, 0)
+    widths = words[:num_offsets]
+    heights = words[2 : 2 + num_offsets]
+    # Reasonable image dimensions
+    mask = (widths >= 1) & (widths <= 4096) & (heights >= 1) & (heights <= 4096)
+    for i, w, h in zip(
+        np.flatnonzero(mask).tolist(), widths[mask].tolist(), heights[mask].tolist()
+    ):
+        headers.append(
+            {
+                "offset": i,
+                "type": "Possible dimensions",
+                "values": {"width": w, "height": h},
+            }
+        )
 
     return headers
 
 
+def _analyze_data(data, results: dict) -> None:
+    """
+    Fill in analyze_file results from the file contents (bytes or mmap).
+    """
+    # The numpy-heavy analyses mostly run with the GIL released, so they
+    # run side by side while the hex dumps are built here
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        # Find repeating patterns
+        patterns = executor.submit(analyze_byte_patterns, data)
+
+        # Analyze byte value distribution
+        byte_analysis = executor.submit(analyze_value_ranges, data)
+
+        # Look for potential headers
+        potential_headers = executor.submit(find_potential_headers, data)
+
+        # Analyze file in sections
+        section_size = min(256, len(data))
+        sections = [
+            ("header", 0, section_size),
+            (
+                "middle",
+                len(data) // 2 - section_size // 2,
+                len(data) // 2 + section_size // 2,
+            ),
+            ("end", max(0, len(data) - section_size), len(data)),
+        ]
+
+        for name, start, end in sections:
+            section_data = data[start:end]
+            results["sections"].append(
+                {
+                    "name": name,
+                    "offset": start,
+                    "size": len(section_data),
+                    "hex_dump": dump_bytes(section_data, start),
+                }
+            )
+
+        results["patterns"] = patterns.result()
+        results["byte_analysis"] = byte_analysis.result()
+        results["potential_headers"] = potential_headers.result()
+
+    # Generate structure hints
+    if results["byte_analysis"]["ranges"]["192-255"] > 0:
+        results["structure_hints"].append(
+            "Contains bytes >= 192, possible RLE compression markers"
+        )
+
+    # Look for potential palette data (sequences of RGB triplets): check
+    # each 768-byte block that ends before the last byte of the file
+    num_blocks = max(len(data) - 1, 0) // 768
+    blocks = np.frombuffer(data, dtype=np.uint8, count=num_blocks * 768)
+    # Values < 64 are common for 6-bit color components
+    palette_blocks = (blocks.reshape(num_blocks, 768) < 64).all(axis=1)
+    for block in np.flatnonzero(palette_blocks).tolist():
+        results["structure_hints"].append(
+            f"Possible 256-color palette at offset {block * 768} "
+            "(768 bytes of RGB triplets with values < 64)"
+        )
+
+    # Check for common section sizes
+    if len(data) > 768:  # Size of a 256-color palette
+        results["structure_hints"].append(
+            "File is large enough to contain a 256-color palette"
+        )
+
+
 def analyze_file(filepath: Path) -> dict:
     """
     Perform detailed analysis of a file's binary content.
@@ -140,62 +233,14 @@ def analyze_file(filepath: Path) -> dict:
 
     try:
         with open(filepath, "rb") as f:
-            data = f.read()
-
-            # Analyze file in sections
-            section_size = min(256, len(data))
-            sections = [
-                ("header", 0, section_size),
-                (
-                    "middle",
-                    len(data) // 2 - section_size // 2,
-                    len(data) // 2 + section_size // 2,
-                ),
-                ("end", max(0, len(data) - section_size), len(data)),
-            ]
-
-            for name, start, end in sections:
-                section_data = data[start:end]
-                results["sections"].append(
-                    {
-                        "name": name,
-                        "offset": start,
-                        "size": len(section_data),
-                        "hex_dump": dump_bytes(section_data, start),
-                    }
-                )
-
-            # Find repeating patterns
-            results["patterns"] = analyze_byte_patterns(data)
-
-            # Analyze byte value distribution
-            results["byte_analysis"] = analyze_value_ranges(data)
-
-            # Look for potential headers
-            results["potential_headers"] = find_potential_headers(data)
-
-            # Generate structure hints
-            if results["byte_analysis"]["ranges"]["192-255"] > 0:
-                results["structure_hints"].append(
-                    "Contains bytes >= 192, possible RLE compression markers"
-                )
-
-            # Look for potential palette data (sequences of RGB triplets)
-            for i in range(0, len(data) - 768, 768):
-                rgb_triplets = data[i : i + 768]
-                if all(
-                    v < 64 for v in rgb_triplets
-                ):  # Common for 6-bit color components
-                    results["structure_hints"].append(
-                        f"Possible 256-color palette at offset {i} "
-                        "(768 bytes of RGB triplets with values < 64)"
-                    )
-
-            # Check for common section sizes
-            if len(data) > 768:  # Size of a 256-color palette
-                results["structure_hints"].append(
-                    "File is large enough to contain a 256-color palette"
-                )
+            if results["filesize"] == 0:
+                # mmap can't map an empty file
+                _analyze_data(b"", results)
+            else:
+                # Map the file instead of reading it; slices taken for the
+                # hex dumps are the only copies made
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    _analyze_data(data, results)
 
     except Exception as e:
         results["error"] = str(e)
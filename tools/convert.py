@@ -5,14 +5,17 @@ Handles conversion of all file types to modern formats.
 """
 
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from .convert_pc8 import convert_image as convert_pc8
 from .convert_pc4 import convert_image as convert_pc4
 from .convert_snd import convert_snd
 from .convert_text import convert_text
 from .convert_xmi import convert_xmi
-from .convert_ctr import convert_ctr
+from .convert_ctr import MIN_PARALLEL_FILES, convert_ctr
 from .convert_ani import convert_ani
 from .convert_lst import convert_lst
 
@@ -22,6 +25,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Map file types to converter functions
+CONVERTERS = {
+    "pc8": convert_pc8,
+    "pc4": convert_pc4,
+    "256": convert_pc8,  # Use same converter for .256 files
+    "xmi": convert_xmi,
+    "snd": convert_snd,
+    "text": convert_text,
+    "ctr": convert_ctr,
+    "ani": convert_ani,
+    "lst": convert_lst,
+}
+
+# Map file extensions to the converters that accept them, in the order they
+# run when no file type is given. Files with any other extension never reach
+# a converter.
+EXTENSION_CONVERTERS = {
+    ".PC8": (convert_pc8,),
+    ".256": (convert_pc8,),
+    ".PC4": (convert_pc4,),
+    ".XMI": (convert_xmi,),
+    ".SND": (convert_snd,),
+    ".TXT": (convert_text,),
+    ".CTR": (convert_text, convert_ctr),  # Both a text copy and parsed JSON
+    ".ANI": (convert_ani,),
+    ".LST": (convert_lst,),
+}
 
 def set_debug(enabled: bool):
     """Enable or disable debug logging"""
@@ -63,16 +93,21 @@ def clean_output_dir(output_dir: Path, file_type: str = None) -> None:
         dir_path = output_dir / subdir
         if dir_path.exists():
             logger.info(f"Cleaning {subdir} directory")
-            for file in dir_path.glob("*"):
-                if file.is_file():
-                    file.unlink()
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False):
+                        os.unlink(entry.path)
         else:
             dir_path.mkdir(parents=True)
             logger.info(f"Created {subdir} directory")
 
 
 def convert_all(
-    input_dir: str, output_dir: str, file_type: str = None, clean: bool = True
+    input_dir: str,
+    output_dir: str,
+    file_type: str = None,
+    clean: bool = True,
+    file_types: Iterable[str] = None,
 ) -> bool:
     """Convert files in input directory
 
@@ -81,6 +116,8 @@ def convert_all(
         output_dir: Output directory for converted files
         file_type: Optional specific type to convert ('pc8', 'xmi', 'snd', 'text')
         clean: Whether to clean output directories before converting (default: True)
+        file_types: Optional several types to convert in a single directory walk
+            (e.g. ['ani', 'ctr']); ignored when file_type is given
 
     Returns:
         bool: True if all conversions successful
@@ -88,48 +125,95 @@ def convert_all(
     input_path = Path(input_dir)
     output_path = Path(output_dir)
 
+    if file_type:
+        selected = [file_type]
+    elif file_types:
+        selected = list(dict.fromkeys(file_types))
+    else:
+        selected = []
+
     # Clean output directories if requested
     if clean:
-        clean_output_dir(output_path, file_type)
+        if selected:
+            for selected_type in selected:
+                clean_output_dir(output_path, selected_type)
+        else:
+            clean_output_dir(output_path)
     elif not output_path.exists():
         output_path.mkdir(parents=True)
 
-    # Map file types to converter functions
-    converters = {
-        "pc8": convert_pc8,
-        "pc4": convert_pc4,
-        "256": convert_pc8,  # Use same converter for .256 files
-        "xmi": convert_xmi,
-        "snd": convert_snd,
-        "text": convert_text,
-        "ctr": convert_ctr,
-        "ani": convert_ani,
-        "lst": convert_lst,
-    }
+    files = list(_iter_files(input_path))
+    tasks = [(filepath, output_path, selected) for filepath in files]
 
     success = True
-    for filepath in input_path.rglob("*"):
-        if filepath.is_file():
-            if file_type:
-                # Run only specified converter
-                if converters[file_type](filepath, output_path):
-                    logger.debug(f"Converted {filepath.name}")
-                else:
-                    logger.debug(f"Skipped {filepath.name} - not a {file_type} file")
-            else:
-                # Try each converter
-                if not any(
-                    [
-                        convert_pc8(filepath, output_path),
-                        convert_pc4(filepath, output_path),
-                        convert_xmi(filepath, output_path),
-                        convert_snd(filepath, output_path),
-                        convert_text(filepath, output_path),
-                        convert_ctr(filepath, output_path),
-                        convert_ani(filepath, output_path),
-                        convert_lst(filepath, output_path),
-                    ]
-                ):
-                    logger.debug(f"Skipped {filepath.name} - unknown format")
+    if len(tasks) < MIN_PARALLEL_FILES:
+        results = map(_convert_one, tasks)
+        _log_results(results, selected)
+    else:
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+        with ProcessPoolExecutor(
+            max_workers=os.cpu_count(), initializer=set_debug, initargs=(debug,)
+        ) as executor:
+            results = executor.map(_convert_one, tasks, chunksize=8)
+            _log_results(results, selected)
 
     return success
+
+
+def _iter_files(root: Path) -> Iterator[Path]:
+    """Yield every file under root, using the type info os.scandir caches"""
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except (FileNotFoundError, NotADirectoryError):
+            # Like rglob, a missing or non-directory root yields nothing
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield Path(entry.path)
+
+
+def _convert_one(task: tuple[Path, Path, list[str]]) -> tuple[str, bool]:
+    """Convert a single file, as a (picklable) process pool task
+
+    Args:
+        task: (filepath, output_path, selected) where selected lists the
+            file types to try; an empty list tries every converter
+
+    Returns:
+        tuple: (file name, whether any converter accepted the file)
+    """
+    filepath, output_path, selected = task
+    candidates = EXTENSION_CONVERTERS.get(filepath.suffix.upper(), ())
+    if selected:
+        # Try the selected converters that take this extension, stopping at
+        # the first that accepts
+        converted = any(
+            CONVERTERS[file_type](filepath, output_path)
+            for file_type in selected
+            if CONVERTERS[file_type] in candidates
+        )
+    else:
+        # Run every converter for the extension (a list, not a generator,
+        # so that .CTR files get both outputs)
+        converted = any(
+            [convert(filepath, output_path) for convert in candidates]
+        )
+    return filepath.name, converted
+
+
+def _log_results(results: Iterable[tuple[str, bool]], selected: list[str]) -> None:
+    """Log the outcome of each _convert_one task"""
+    for name, converted in results:
+        if converted:
+            logger.debug(f"Converted {name}")
+        elif len(selected) == 1:
+            logger.debug(f"Skipped {name} - not a {selected[0]} file")
+        elif selected:
+            logger.debug(f"Skipped {name} - not one of {', '.join(selected)}")
+        else:
+            logger.debug(f"Skipped {name} - unknown format")
@@ -11,8 +11,15 @@ Format details:
 
 import json
 import logging
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    # Fall back to the stdlib encoder when orjson isn't installed
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,8 +32,8 @@ def parse_animation(text: str) -> dict:
     Returns:
         dict: Animation data including frames and coordinates
     """
-    # Split into lines and remove empty lines
-    lines = [line.strip() for line in text.split("\n") if line.strip()]
+    # Split into lines (LF or CRLF), stripping each once and dropping empty ones
+    lines = [line for line in map(str.strip, text.splitlines()) if line]
 
     # First line is the image file reference
     image_file = lines[0]
@@ -90,6 +97,12 @@ def parse_animation(text: str) -> dict:
     return {"image_file": image_file, "frame_count": len(frames), "frames": frames}
 
 
+@lru_cache(maxsize=128)
+def _parse_animation_cached(text: str) -> dict:
+    """Memoized parse_animation for converters; callers must not mutate the result"""
+    return parse_animation(text)
+
+
 def convert_ani(filepath: Path, output_dir: Path) -> bool:
     """Convert ANI to JSON
 
@@ -114,14 +127,19 @@ def convert_ani(filepath: Path, output_dir: Path) -> bool:
             text = f.read()
 
         # Parse animation data
-        animation_data = parse_animation(text)
+        animation_data = _parse_animation_cached(text)
 
         # Create output directory
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Save as JSON
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(animation_data, f, indent=2)
+        if orjson is not None:
+            output_path.write_bytes(
+                orjson.dumps(animation_data, option=orjson.OPT_INDENT_2)
+            )
+        else:
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(animation_data, f, indent=2)
 
         logger.info(f"Converted {filepath.name} to JSON")
         return True
@@ -11,9 +11,18 @@ Format details:
 
 import json
 import logging
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Tuple, Optional, Any
+from typing import Tuple, Optional, Any, Iterable, TextIO, Union
+
+try:
+    import orjson
+except ImportError:
+    # Fall back to the stdlib encoder when orjson isn't installed
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -61,184 +70,257 @@ TEXT_ALIGNMENTS = {0: "left", 1: "center", 2: "right"}
 # Color mappings
 COLOR_NAMES = {0: "black", 6: "gold", 7: "white"}
 
+# Name tables used by _value_name, keyed by the prefix of their fallback names
+NAME_TABLES = {
+    "command": COMMAND_TYPES,
+    "action": ACTION_MAPPINGS,
+    "state": BUTTON_STATES,
+    "color": COLOR_NAMES,
+    "font": FONT_SIZES,
+    "style": TEXT_STYLES,
+    "align": TEXT_ALIGNMENTS,
+}
+
+# Name tables and output keys for each value of the colors ("12,...") and
+# text style ("18,...") commands, in parameter order
+COLOR_KINDS = ("color", "color")
+COLOR_KEYS = ("background", "foreground")
+STYLE_KINDS = ("font", "style", "color", "color", "align")
+STYLE_KEYS = ("font", "style", "background", "foreground", "alignment")
+
+# Image count command ("1,<count>") preceding the image filename lines
+IMAGE_COUNT_PATTERN = re.compile(r"1,(\d+)")
+
+# Any of the command IDs 1-20 followed by a comma, anywhere in a line (so
+# "11," and "20," match as well as "1,"; "30," doesn't)
+COMMAND_LINE_PATTERN = re.compile(r"[1-9],|[12]0,")
+
+# Below this many files a process pool costs more to start than it saves.
+# Shared by convert_ctr_batch and tools.convert.convert_all.
+MIN_PARALLEL_FILES = 4
+
+# Deletion table for the ASCII characters that are neither printable nor
+# whitespace, used by clean_text
+ASCII_CONTROL_CHARS = str.maketrans(
+    "",
+    "",
+    "".join(
+        char
+        for char in map(chr, range(128))
+        if not (char.isprintable() or char.isspace())
+    ),
+)
+
+# Fields CommandSequence takes from earlier commands: type -> (name, key)
+POSITION_FIELDS = {"position_x": ("x", "x"), "position_y": ("y", "y")}
+DIMENSION_FIELDS = {"set_x": ("width", "x"), "set_y": ("height", "y")}
+
 
 class CommandSequence:
     """Track and analyze sequences of commands"""
 
     def __init__(self):
-        self.commands = []
         self.current_element = None
         self.elements = []
         self.metadata = {"images": [], "comments": []}
+        # Earliest and most recent command of each type, which is all the
+        # history the handlers look at. _last is kept ordered from the least
+        # to the most recently seen type.
+        self._first = {}
+        self._last = {}
+
+    @property
+    def last_text_content(self) -> Optional[dict[str, Any]]:
+        """The most recent text_content command, if any"""
+        return self._last.get("text_content")
+
+    def _earliest_values(self, fields: dict[str, tuple[str, str]]) -> dict[str, Any]:
+        """Collect values from the earliest command of each type in fields
+
+        Args:
+            fields: Maps a command type to (result name, command key)
+
+        Returns:
+            dict of result name to value, most recently seen type first
+        """
+        values = {}
+        for cmd_type in reversed(self._last):
+            if cmd_type in fields:
+                name, key = fields[cmd_type]
+                values[name] = self._first[cmd_type].get(key)
+        return values
+
+    def _last_value(self, cmd_type: str, key: str) -> Any:
+        """Get key from the most recent command of cmd_type (None if absent)"""
+        cmd = self._last.get(cmd_type)
+        return cmd.get(key) if cmd else None
 
     def add_command(self, command: dict[str, Any]) -> None:
         """Add a command to the sequence and update tracking"""
-        self.commands.append(command)
+        cmd_type = command.get("type")
+
+        # No handler looks up earlier commands of its own type, so the new
+        # command can be recorded up front
+        self._first.setdefault(cmd_type, command)
+        self._last.pop(cmd_type, None)
+        self._last[cmd_type] = command
 
         # Process command based on type
-        cmd_type = command.get("type")
+        handler = self._ADD_HANDLERS.get(cmd_type)
+        if handler:
+            handler(self, command)
 
-        if cmd_type == "comment":
-            comment_text = command.get("text", "")
-            self.metadata["comments"].append(comment_text)
+    def _add_comment(self, command: dict[str, Any]) -> None:
+        """Record a comment, starting a section at section markers"""
+        comment_text = command.get("text", "")
+        self.metadata["comments"].append(comment_text)
 
-            # Check for section markers
-            if "icon buttons" in comment_text.lower():
-                self._finish_current_element()
-                self.current_element = {"type": "button_section", "buttons": []}
-            elif "load the images" in comment_text.lower():
+        # Check for section markers
+        if "icon buttons" in comment_text.lower():
+            self._finish_current_element()
+            self.current_element = {"type": "button_section", "buttons": []}
+        elif "load the images" in comment_text.lower():
+            self._finish_current_element()
+            self.current_element = {"type": "image_section", "images": []}
+        elif "text" in comment_text.lower():
+            self._finish_current_element()
+            self.current_element = {"type": "text_section", "blocks": []}
+
+    def _add_image_count(self, command: dict[str, Any]) -> None:
+        """Set the image count of the current image section"""
+        if self.current_element and self.current_element["type"] == "image_section":
+            self.current_element["count"] = command.get("count", 1)
+
+    def _add_text_content(self, command: dict[str, Any]) -> None:
+        """Fill the current text block or start one in a text section"""
+        text = command.get("text", "")
+        if text and self.current_element:
+            if self.current_element["type"] == "text_block":
+                self.current_element["content"] = text
                 self._finish_current_element()
-                self.current_element = {"type": "image_section", "images": []}
-            elif "text" in comment_text.lower():
+
+            elif self.current_element["type"] == "text_section":
+                # Create a new text block
                 self._finish_current_element()
-                self.current_element = {"type": "text_section", "blocks": []}
-
-        elif cmd_type == "image_count":
-            if self.current_element and self.current_element["type"] == "image_section":
-                self.current_element["count"] = command.get("count", 1)
-
-        elif cmd_type == "text_content":
-            text = command.get("text", "")
-            if text and self.current_element:
-                if self.current_element["type"] == "text_block":
-                    self.current_element["content"] = text
-                    self._finish_current_element()
-
-                elif self.current_element["type"] == "text_section":
-                    # Create a new text block
-                    self._finish_current_element()
-                    self.current_element = {"type": "text_block", "content": text}
-
-                    # Get previous style if available
-                    for cmd in reversed(self.commands[:-1]):
-                        if cmd.get("type") == "text_style":
-                            self.current_element["style"] = cmd.get("style", {})
-                            break
-
-                    # Get previous position if available
-                    position = {}
-                    for cmd in reversed(self.commands[:-1]):
-                        if cmd.get("type") == "position_x":
-                            position["x"] = cmd.get("x")
-                        elif cmd.get("type") == "position_y":
-                            position["y"] = cmd.get("y")
-
-                    if position:
-                        self.current_element["position"] = position
-
-        elif cmd_type == "button_properties":
-            properties = command.get("properties", {})
-            position = {}
-
-            # Get most recent X position
-            for cmd in reversed(self.commands[:-1]):
-                if cmd.get("type") == "position_x":
-                    position["x"] = cmd.get("x")
-                    break
-
-            # Get most recent Y section and offset
-            y_section = None
-            y_offset = None
-            for cmd in reversed(self.commands[:-1]):
-                if cmd.get("type") == "set_y" and y_section is None:
-                    y_section = cmd.get("y")
-                elif cmd.get("type") == "position_y" and y_offset is None:
-                    y_offset = cmd.get("y")
-
-            if y_section is not None and y_offset is not None:
-                position["y"] = y_offset
-                position["y_section"] = y_section
-            elif y_offset is not None:
-                position["y"] = y_offset
-
-            # Create button element
-            button = {"type": "button", "properties": properties, "position": position}
-
-            # Add to buttons section or as standalone
-            if (
-                self.current_element
-                and self.current_element["type"] == "button_section"
-            ):
-                self.current_element["buttons"].append(button)
+                self.current_element = {"type": "text_block", "content": text}
+
+                # Get previous style if available
+                style_cmd = self._last.get("text_style")
+                if style_cmd:
+                    self.current_element["style"] = style_cmd.get("style", {})
+
+                # Get the first position set, if any
+                position = self._earliest_values(POSITION_FIELDS)
+
+                if position:
+                    self.current_element["position"] = position
+
+    def _add_button_properties(self, command: dict[str, Any]) -> None:
+        """Create a button at the most recent position"""
+        properties = command.get("properties", {})
+        position = {}
+
+        # Get most recent X position
+        if "position_x" in self._last:
+            position["x"] = self._last_value("position_x", "x")
+
+        # Get most recent Y section and offset
+        y_section = self._last_value("set_y", "y")
+        y_offset = self._last_value("position_y", "y")
+
+        if y_section is not None and y_offset is not None:
+            position["y"] = y_offset
+            position["y_section"] = y_section
+        elif y_offset is not None:
+            position["y"] = y_offset
+
+        # Create button element
+        button = {"type": "button", "properties": properties, "position": position}
+
+        # Add to buttons section or as standalone
+        if (
+            self.current_element
+            and self.current_element["type"] == "button_section"
+        ):
+            self.current_element["buttons"].append(button)
+        else:
+            self._finish_current_element()
+            self.current_element = button
+
+    def _add_text_style(self, command: dict[str, Any]) -> None:
+        """Apply a text style to the current text block"""
+        style = command.get("style", {})
+
+        if self.current_element:
+            if self.current_element["type"] == "text_block":
+                self.current_element["style"] = style
+            elif self.current_element["type"] == "text_section":
+                # Store for next text block
+                pass
+        else:
+            self.current_element = {"type": "text_block", "style": style}
+
+    def _add_set_color(self, command: dict[str, Any]) -> None:
+        """Color the current element, or start a panel after positioning"""
+        colors = command.get("colors", {})
+
+        # Find what this color applies to
+        # Look for recent position/dimension commands
+        has_position = any(
+            cmd_type in self._last
+            for cmd_type in ("set_x", "set_y", "position_x", "position_y")
+        )
+
+        if has_position:
+            # This is likely a dialog or panel
+            if self.current_element and self.current_element["type"] not in [
+                "image_section",
+                "button_section",
+                "text_section",
+            ]:
+                self.current_element["colors"] = colors
             else:
                 self._finish_current_element()
-                self.current_element = button
+                self.current_element = {"type": "panel", "colors": colors}
 
-        elif cmd_type == "text_style":
-            style = command.get("style", {})
+                # Get the first dimensions and position set, if any
+                dimensions = self._earliest_values(DIMENSION_FIELDS)
+                position = self._earliest_values(POSITION_FIELDS)
 
+                if dimensions:
+                    self.current_element["dimensions"] = dimensions
+                if position:
+                    self.current_element["position"] = position
+        else:
+            # This is probably a color for text or other element
             if self.current_element:
-                if self.current_element["type"] == "text_block":
-                    self.current_element["style"] = style
-                elif self.current_element["type"] == "text_section":
-                    # Store for next text block
-                    pass
-            else:
-                self.current_element = {"type": "text_block", "style": style}
-
-        elif cmd_type == "set_color":
-            colors = command.get("colors", {})
-
-            # Find what this color applies to
-            # Look for recent position/dimension commands
-            has_position = False
-            for cmd in reversed(self.commands[:-1]):
-                if cmd.get("type") in ["set_x", "set_y", "position_x", "position_y"]:
-                    has_position = True
-                    break
-
-            if has_position:
-                # This is likely a dialog or panel
-                if self.current_element and self.current_element["type"] not in [
-                    "image_section",
-                    "button_section",
-                    "text_section",
-                ]:
-                    self.current_element["colors"] = colors
-                else:
-                    self._finish_current_element()
-                    self.current_element = {"type": "panel", "colors": colors}
-
-                    # Get dimensions if available
-                    dimensions = {}
-                    position = {}
-                    for cmd in reversed(self.commands[:-1]):
-                        if cmd.get("type") == "set_x":
-                            dimensions["width"] = cmd.get("x")
-                        elif cmd.get("type") == "set_y":
-                            dimensions["height"] = cmd.get("y")
-                        elif cmd.get("type") == "position_x":
-                            position["x"] = cmd.get("x")
-                        elif cmd.get("type") == "position_y":
-                            position["y"] = cmd.get("y")
-
-                    if dimensions:
-                        self.current_element["dimensions"] = dimensions
-                    if position:
-                        self.current_element["position"] = position
-            else:
-                # This is probably a color for text or other element
-                if self.current_element:
-                    self.current_element["colors"] = colors
-
-        elif cmd_type == "input_field":
-            field = command.get("field", {})
-            position = {}
-
-            # Get most recent position
-            for cmd in reversed(self.commands[:-1]):
-                if cmd.get("type") == "position_x":
-                    position["x"] = cmd.get("x")
-                elif cmd.get("type") == "position_y":
-                    position["y"] = cmd.get("y")
-
-            # Create input field element
-            self._finish_current_element()
-            self.current_element = {
-                "type": "input_field",
-                "field": field,
-                "position": position,
-            }
+                self.current_element["colors"] = colors
+
+    def _add_input_field(self, command: dict[str, Any]) -> None:
+        """Create an input field at the first position set"""
+        field = command.get("field", {})
+
+        # Get the first position set, if any
+        position = self._earliest_values(POSITION_FIELDS)
+
+        # Create input field element
+        self._finish_current_element()
+        self.current_element = {
+            "type": "input_field",
+            "field": field,
+            "position": position,
+        }
+
+    # add_command handlers, by command type
+    _ADD_HANDLERS = {
+        "comment": _add_comment,
+        "image_count": _add_image_count,
+        "text_content": _add_text_content,
+        "button_properties": _add_button_properties,
+        "text_style": _add_text_style,
+        "set_color": _add_set_color,
+        "input_field": _add_input_field,
+    }
 
     def _finish_current_element(self) -> None:
         """Finish the current element and add it to elements list"""
@@ -300,25 +382,24 @@ def split_commands(line: str) -> list[str]:
 
     # Handle lines with command numbers separated by spaces
     commands = []
-    parts = line.split()
-    current_cmd = ""
+    current_cmd = []
 
-    for part in parts:
+    for part in line.split():
         # If it starts with a number and looks like a command
-        if part and part[0].isdigit() and (part[1:2] == "," or part.isdigit()):
+        if part[0].isdigit() and (part[1:2] == "," or part.isdigit()):
             # If we have a previous command, add it
             if current_cmd:
-                commands.append(current_cmd)
+                commands.append(" ".join(current_cmd))
 
             # Start a new command
-            current_cmd = part
+            current_cmd = [part]
         elif current_cmd:
             # Add to current command if it exists
-            current_cmd += " " + part
+            current_cmd.append(part)
 
     # Add the final command if any
     if current_cmd:
-        commands.append(current_cmd)
+        commands.append(" ".join(current_cmd))
 
     # If nothing was found but line isn't empty, return the whole line
     if not commands and line:
@@ -327,6 +408,127 @@ def split_commands(line: str) -> list[str]:
     return commands
 
 
+@lru_cache(maxsize=1024)
+def _value_name(kind: str, value: int) -> str:
+    """Name a CTR value from its table, or "<kind>_<value>" if it isn't listed
+
+    Memoized, so repeated unknown values share one string.
+    """
+    return NAME_TABLES[kind].get(value, f"{kind}_{value}")
+
+
+# Screens repeat the same buttons, colors and styles, so the integer and
+# name lookups behind these parameter parsers are memoized as tuples. Each
+# call still builds a fresh dict, so parse results never share state.
+
+
+@lru_cache(maxsize=4096)
+def _button_values(params: str) -> Optional[tuple]:
+    """Split and name "group,index,action,state" button parameters"""
+    props = list(map(int, params.split(",")))
+    if len(props) < 4:
+        return None
+
+    # Map properties to meaningful names
+    action_id = props[2]
+    state_value = props[3]
+    return (
+        props[0],
+        props[1],
+        action_id,
+        _value_name("action", action_id),
+        state_value,
+        _value_name("state", state_value),
+    )
+
+
+def _parse_button_properties(params: str) -> Optional[dict[str, Any]]:
+    """Parse "group,index,action,state" button parameters"""
+    values = _button_values(params)
+    if values is None:
+        return None
+
+    group, index, action_id, action_name, state_value, state_name = values
+    return {
+        "group": group,
+        "index": index,
+        "action": {"id": action_id, "name": action_name},
+        "state": {"value": state_value, "name": state_name},
+    }
+
+
+@lru_cache(maxsize=4096)
+def _named_values(params: str, kinds: tuple[str, ...]) -> Optional[tuple]:
+    """Split integer parameters and name each one from its kind's table
+
+    Returns:
+        tuple of (value, name) pairs, or None if there are too few values
+    """
+    values = list(map(int, params.split(",")))
+    if len(values) < len(kinds):
+        return None
+
+    return tuple(
+        (value, _value_name(kind, value)) for kind, value in zip(kinds, values)
+    )
+
+
+def _parse_named(
+    params: str, kinds: tuple[str, ...], keys: tuple[str, ...]
+) -> Optional[dict[str, Any]]:
+    """Build a {key: {"value": ..., "name": ...}} dict from _named_values"""
+    values = _named_values(params, kinds)
+    if values is None:
+        return None
+
+    return {
+        key: {"value": value, "name": name}
+        for key, (value, name) in zip(keys, values)
+    }
+
+
+def _parse_colors(params: str) -> Optional[dict[str, Any]]:
+    """Parse "background,foreground" color parameters"""
+    return _parse_named(params, COLOR_KINDS, COLOR_KEYS)
+
+
+def _parse_text_style(params: str) -> Optional[dict[str, Any]]:
+    """Parse "font,style,background,foreground,alignment" style parameters"""
+    return _parse_named(params, STYLE_KINDS, STYLE_KEYS)
+
+
+def _parse_input_field(params: str) -> Optional[dict[str, int]]:
+    """Parse "width,type,id" input field parameters"""
+    field_props = list(map(int, params.split(",")))
+    if len(field_props) < 3:
+        return None
+
+    return {
+        "width": field_props[0],
+        "type": field_props[1],
+        "id": field_props[2],
+    }
+
+
+# Parameter parsers by command ID, as (command key, parser); the key is left
+# out when the parser returns None
+PARAM_PARSERS = {
+    1: ("count", int),  # Image count
+    4: ("x", int),  # Coordinates
+    5: ("y", int),
+    6: ("x", int),
+    7: ("y", int),
+    8: ("properties", _parse_button_properties),
+    10: ("text", str),  # Text content
+    11: ("field", _parse_input_field),
+    12: ("colors", _parse_colors),
+    17: ("text", str),  # Comment
+    18: ("style", _parse_text_style),
+    19: ("spacing", int),
+    20: ("spacing", int),
+}
+
+
 def parse_command(cmd_str: str) -> Optional[dict[str, Any]]:
     """Parse a single CTR command
 
@@ -351,7 +553,7 @@ def parse_command(cmd_str: str) -> Optional[dict[str, Any]]:
         cmd_id = int(parts[0].strip())
 
         # Get command type
-        cmd_type = COMMAND_TYPES.get(cmd_id, f"command_{cmd_id}")
+        cmd_type = _value_name("command", cmd_id)
 
         # Basic command info
         command = {"command": cmd_id, "type": cmd_type}
@@ -363,92 +565,11 @@ def parse_command(cmd_str: str) -> Optional[dict[str, Any]]:
             if params.endswith(","):
                 params = params[:-1]
 
-            if cmd_id == 1:  # Image count
-                command["count"] = int(params)
-
-            elif cmd_id in [4, 5, 6, 7]:  # Coordinates
-                command["x" if cmd_id in [4, 6] else "y"] = int(params)
-
-            elif cmd_id == 8:  # Button properties
-                props = [int(p.strip()) for p in params.split(",")]
-                if len(props) >= 4:
-                    # Map properties to meaningful names
-                    action_id = props[2]
-                    action_name = ACTION_MAPPINGS.get(action_id, f"action_{action_id}")
-                    state_value = props[3]
-                    state_name = BUTTON_STATES.get(state_value, f"state_{state_value}")
-
-                    command["properties"] = {
-                        "group": props[0],
-                        "index": props[1],
-                        "action": {"id": action_id, "name": action_name},
-                        "state": {"value": state_value, "name": state_name},
-                    }
-
-            elif cmd_id == 10:  # Text content
-                command["text"] = params
-
-            elif cmd_id == 11:  # Input field
-                field_props = [int(p.strip()) for p in params.split(",")]
-                if len(field_props) >= 3:
-                    command["field"] = {
-                        "width": field_props[0],
-                        "type": field_props[1],
-                        "id": field_props[2],
-                    }
-
-            elif cmd_id == 12:  # Color
-                color_props = [int(p.strip()) for p in params.split(",")]
-                if len(color_props) >= 2:
-                    # Map colors to names where known
-                    bg_name = COLOR_NAMES.get(color_props[0], f"color_{color_props[0]}")
-                    fg_name = (
-                        COLOR_NAMES.get(color_props[1], f"color_{color_props[1]}")
-                        if len(color_props) > 1
-                        else None
-                    )
-
-                    command["colors"] = {
-                        "background": {"value": color_props[0], "name": bg_name}
-                    }
-
-                    if fg_name:
-                        command["colors"]["foreground"] = {
-                            "value": color_props[1],
-                            "name": fg_name,
-                        }
-
-            elif cmd_id == 17:  # Comment
-                command["text"] = params
-
-            elif cmd_id == 18:  # Text style
-                style_props = [int(p.strip()) for p in params.split(",")]
-                if len(style_props) >= 5:
-                    # Map style values to names
-                    font_name = FONT_SIZES.get(style_props[0], f"font_{style_props[0]}")
-                    style_name = TEXT_STYLES.get(
-                        style_props[1], f"style_{style_props[1]}"
-                    )
-                    bg_name = COLOR_NAMES.get(style_props[2], f"color_{style_props[2]}")
-                    fg_name = COLOR_NAMES.get(style_props[3], f"color_{style_props[3]}")
-                    align_name = TEXT_ALIGNMENTS.get(
-                        style_props[4], f"align_{style_props[4]}"
-                    )
-
-                    command["style"] = {
-                        "font": {"value": style_props[0], "name": font_name},
-                        "style": {"value": style_props[1], "name": style_name},
-                        "background": {"value": style_props[2], "name": bg_name},
-                        "foreground": {"value": style_props[3], "name": fg_name},
-                        "alignment": {"value": style_props[4], "name": align_name},
-                    }
-
-            elif cmd_id in [19, 20]:  # Spacing
-                command["spacing"] = int(params)
-
-            else:
-                # For unknown commands, store raw params
-                command["params"] = params
+            # Unknown commands keep their raw params
+            key, parser = PARAM_PARSERS.get(cmd_id, ("params", str))
+            value = parser(params)
+            if value is not None:
+                command[key] = value
 
         return command
 
@@ -471,7 +592,7 @@ def parse_image_lines(lines: list[str], start_idx: int) -> Tuple[list[str], int]
 
     # Get image count from previous line
     if start_idx > 0:
-        count_match = re.match(r"1,(\d+)", lines[start_idx - 1])
+        count_match = IMAGE_COUNT_PATTERN.match(lines[start_idx - 1])
         if count_match:
             image_count = int(count_match.group(1))
 
@@ -502,29 +623,43 @@ def clean_text(text: str) -> str:
     Returns:
         Cleaned text
     """
-    # Remove control characters and normalize whitespace
-    cleaned = "".join(char for char in text if char.isprintable() or char.isspace())
+    # Remove control characters, in C for the usual all-ASCII text
+    if text.isascii():
+        cleaned = text.translate(ASCII_CONTROL_CHARS)
+    else:
+        cleaned = "".join(
+            char for char in text if char.isprintable() or char.isspace()
+        )
     # Normalize whitespace
     cleaned = " ".join(cleaned.split())
     return cleaned
 
 
-def parse_ctr_file(filepath: Path) -> dict[str, Any]:
+def parse_ctr_file(source: Union[Path, str, TextIO]) -> dict[str, Any]:
     """Parse a CTR file into structured data
 
     Args:
-        filepath: Path to CTR file
+        source: Path to CTR file, or an open text stream (its ``name``
+            attribute, if any, is used as the filename)
 
     Returns:
         dict containing structured data
     """
-    # Read the file
-    with open(filepath, "r", encoding="ascii", errors="replace") as f:
-        content = f.read()
-
-    # Split into lines and remove empty lines
-    lines = [line.strip() for line in content.split("\n")]
-    lines = [line for line in lines if line]
+    # Read the file, split it into lines and remove empty lines
+    if isinstance(source, (str, Path)):
+        filepath = Path(source)
+        # bytes.splitlines breaks on \n, \r\n and \r like text mode's
+        # universal newlines; each line is then decoded on its own
+        lines = [
+            line
+            for raw_line in filepath.read_bytes().splitlines()
+            if (line := raw_line.decode("ascii", errors="replace").strip())
+        ]
+    else:
+        filepath = Path(getattr(source, "name", ""))
+        lines = [
+            line for raw_line in source.read().split("\n") if (line := raw_line.strip())
+        ]
 
     # Initialize sequence tracker
     sequence = CommandSequence()
@@ -535,7 +670,8 @@ def parse_ctr_file(filepath: Path) -> dict[str, Any]:
         line = lines[i]
 
         # Skip empty lines or lines that only contain control characters
-        if not line or not clean_text(line):
+        cleaned_line = clean_text(line)
+        if not cleaned_line:
             i += 1
             continue
 
@@ -546,7 +682,7 @@ def parse_ctr_file(filepath: Path) -> dict[str, Any]:
                 # Process image filenames
                 images, next_idx = parse_image_lines(lines, i + 1)
                 sequence.metadata["images"] = [
-                    clean_text(img) for img in images if clean_text(img)
+                    cleaned_img for img in images if (cleaned_img := clean_text(img))
                 ]
                 sequence.add_command(command)
                 i = next_idx
@@ -577,9 +713,7 @@ def parse_ctr_file(filepath: Path) -> dict[str, Any]:
                 continue
 
         # For other lines, try to split into commands only if they contain command-like patterns
-        if any(cmd_pattern in line for cmd_pattern in [",", " "]) and any(
-            str(i) + "," in line for i in range(1, 21)
-        ):
+        if COMMAND_LINE_PATTERN.search(line):
             # Split line into individual commands and process each one
             commands = line.split()
             for cmd_str in commands:
@@ -592,26 +726,18 @@ def parse_ctr_file(filepath: Path) -> dict[str, Any]:
             # If it's not a command line, it might be an image filename or other content
             if i > 0 and lines[i - 1].startswith("1,"):
                 # This is likely an image filename after image count
-                cleaned_line = clean_text(line)
-                if cleaned_line:
-                    sequence.metadata["images"].append(cleaned_line)
+                sequence.metadata["images"].append(cleaned_line)
             elif not line[0].isdigit():
                 # This might be a continuation of a text field or other content
-                cleaned_line = clean_text(line)
-                if cleaned_line:
-                    text_appended = False
-                    for cmd in reversed(sequence.commands):
-                        if cmd.get("type") == "text_content":
-                            # Append to the previous text content
-                            cmd["text"] += " " + cleaned_line
-                            text_appended = True
-                            break
-
-                    # If we didn't append to existing text, treat it as a comment
-                    if not text_appended:
-                        sequence.add_command(
-                            {"command": 17, "type": "comment", "text": cleaned_line}
-                        )
+                text_cmd = sequence.last_text_content
+                if text_cmd:
+                    # Append to the previous text content
+                    text_cmd["text"] += " " + cleaned_line
+                else:
+                    # No text to append to, so treat it as a comment
+                    sequence.add_command(
+                        {"command": 17, "type": "comment", "text": cleaned_line}
+                    )
 
         i += 1
 
@@ -624,6 +750,27 @@ def parse_ctr_file(filepath: Path) -> dict[str, Any]:
     return result
 
 
+def _encode_json(data: dict[str, Any]) -> bytes:
+    """Serialize converter output as indented JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    # Parsed CTR data is a plain tree, so skip the encoder's cycle check
+    return json.dumps(data, indent=2, check_circular=False).encode("ascii")
+
+
+def _encode_json_line(data: dict[str, Any]) -> bytes:
+    """Serialize converter output as one compact JSON Lines record"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(data, separators=(",", ":")).encode("ascii") + b"\n"
+
+
+@lru_cache(maxsize=128)
+def _ctr_json_cached(path: str, mtime_ns: int, size: int) -> bytes:
+    """Parse and serialize a CTR file, memoized on (path, mtime, size)"""
+    return _encode_json(parse_ctr_file(Path(path)))
+
+
 def convert_ctr(filepath: Path, output_dir: Path) -> bool:
     """Convert CTR to JSON
 
@@ -643,15 +790,15 @@ def convert_ctr(filepath: Path, output_dir: Path) -> bool:
             logger.debug(f"Skipping {filepath.name} - already converted")
             return True
 
-        # Parse the CTR file
-        data = parse_ctr_file(filepath)
+        # Parse and encode the CTR file (reused while the file is unchanged)
+        stat = filepath.stat()
+        encoded = _ctr_json_cached(str(filepath), stat.st_mtime_ns, stat.st_size)
 
         # Create output directory
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Save as JSON
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        output_path.write_bytes(encoded)
 
         logger.info(f"Converted {filepath.name} to JSON")
         return True
@@ -659,3 +806,83 @@ def convert_ctr(filepath: Path, output_dir: Path) -> bool:
     except Exception as e:
         logger.error(f"Error converting {filepath.name}: {str(e)}")
         return False
+
+
+def convert_ctr_batch(filepaths: Iterable[Path], output_dir: Path) -> list[bool]:
+    """Convert several CTR files to JSON, one process pool task per file
+
+    Args:
+        filepaths: Paths to CTR files
+        output_dir: Output directory for converted files
+
+    Returns:
+        list of convert_ctr results, in the order of filepaths (True for
+        files already converted, as convert_ctr would return)
+    """
+    filepaths = list(filepaths)
+    results = [True] * len(filepaths)
+
+    # List the existing outputs once instead of stat()ing each one
+    try:
+        with os.scandir(output_dir / "controls") as entries:
+            existing = {entry.name for entry in entries}
+    except FileNotFoundError:
+        existing = set()
+
+    # Already converted CTR files are skipped without starting a task
+    pending = [
+        i
+        for i, filepath in enumerate(filepaths)
+        if not (
+            filepath.name.upper().endswith(".CTR")
+            and f"{filepath.stem}.json" in existing
+        )
+    ]
+
+    if not pending:
+        return results
+
+    convert = partial(convert_ctr, output_dir=output_dir)
+    todo = [filepaths[i] for i in pending]
+    if len(todo) < MIN_PARALLEL_FILES:
+        # Not worth starting a process pool for a handful of files
+        for i, result in zip(pending, map(convert, todo)):
+            results[i] = result
+        return results
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        converted = executor.map(convert, todo, chunksize=32)
+        for i, result in zip(pending, converted):
+            results[i] = result
+    return results
+
+
+def convert_ctr_batch_jsonl(filepaths: Iterable[Path], output_path: Path) -> int:
+    """Convert several CTR files into a single JSON Lines file
+
+    Each line holds one file's parsed data (identified by its "filename"
+    key), so a batch creates one output file instead of one per CTR file.
+
+    Args:
+        filepaths: Paths to CTR files; other files are skipped
+        output_path: JSON Lines file to write
+
+    Returns:
+        int: Number of CTR files written
+    """
+    written = 0
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "wb") as f:
+        for filepath in filepaths:
+            if not filepath.name.upper().endswith(".CTR"):
+                continue
+            try:
+                record = _encode_json_line(parse_ctr_file(filepath))
+            except Exception as e:
+                logger.error(f"Error converting {filepath.name}: {str(e)}")
+                continue
+            f.write(record)
+            written += 1
+
+    logger.info(f"Converted {written} CTR files to {output_path.name}")
+    return written
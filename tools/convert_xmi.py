@@ -12,6 +12,7 @@ Format details:
 """
 
 import logging
+from functools import lru_cache
 from pathlib import Path
 import struct
 from typing import Optional
@@ -123,8 +124,13 @@ def read_xmi_delay(data: bytes, pos: int) -> tuple[int, int]:
     return value, pos
 
 
+@lru_cache(maxsize=1024)
 def write_variable_length(value: int) -> bytes:
-    """Write standard MIDI variable length value"""
+    """Write standard MIDI variable length value
+
+    Encodings are memoized: a song's delta times repeat a handful of values.
+    The cache is bounded since delta times are arbitrary across a batch.
+    """
     result = bytearray()
     while value >= 0x80:
         result.append(0x80 | (value & 0x7F))
@@ -341,6 +347,7 @@ def convert_xmi(filepath: Path, output_dir: Path) -> bool:
                 main_events.append((0, bytes([0xC0 | channel, mt32_patch])))
 
             # Process EVNT chunk
+            log_notes = filepath.name == "DEATH.XMI"
             pos = 0
             event_type = None
             current_time = 0
@@ -411,7 +418,7 @@ def convert_xmi(filepath: Path, output_dir: Path) -> bool:
                                 (current_time + duration, bytes(event_data))
                             )
 
-                            if filepath.name == "DEATH.XMI":
+                            if log_notes:
                                 logger.debug(
                                     f"Note: ch={event_type & 0x0F} note={note} vel={velocity} raw_dur={raw_duration} dur={duration} time={current_time}"
                                 )
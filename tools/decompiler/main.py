@@ -6,6 +6,7 @@ Implements a modular analyzer-based architecture for decompiling DOS executables
 import argparse
 import os
 import logging
+import traceback
 import matplotlib
 # Force matplotlib to not use any Xwindows backend
 matplotlib.use('Agg')
@@ -376,7 +377,6 @@ def main():
     except Exception as e:
         logger.error(f"Error during decompilation: {str(e)}")
         if args.debug:
-            import traceback
             logger.error(traceback.format_exc())
         return 1
 
@@ -29,8 +29,7 @@ def ensure_directory(directory):
     Args:
         directory: The directory path to ensure exists
     """
-    if not os.path.exists(directory):
-        os.makedirs(directory)
+    os.makedirs(directory, exist_ok=True)
     return directory
 
 
@@ -480,7 +480,7 @@ class GXLExtractor(ResourceExtractor):
 
                         # Calculate checksum for integrity verification
                         if verify_integrity:
-                            file_hash = hashlib.md5(data).hexdigest()
+                            file_hash = hashlib.sha256(data).hexdigest()
 
                         # Save file data
                         output_path = os.path.join(output_dir, entry.name)
@@ -490,8 +490,9 @@ class GXLExtractor(ResourceExtractor):
                         # Verify integrity if requested
                         if verify_integrity:
                             with open(output_path, "rb") as check_file:
-                                check_data = check_file.read()
-                                check_hash = hashlib.md5(check_data).hexdigest()
+                                check_hash = hashlib.file_digest(
+                                    check_file, "sha256"
+                                ).hexdigest()
 
                                 if check_hash != file_hash:
                                     logger.error(
@@ -614,7 +615,8 @@ class GXLExtractor(ResourceExtractor):
             )
 
         # Calculate accounted size (header + file table + all files)
-        accounted_size = first_data_offset + sum(entry.size for entry in self.entries)
+        data_size = sum(entry.size for entry in self.entries)
+        accounted_size = first_data_offset + data_size
         unaccounted_pct = (
             (unaccounted_bytes / self.file_size) * 100 if self.file_size > 0 else 0
         )
@@ -650,6 +652,7 @@ class GXLExtractor(ResourceExtractor):
             "file_size": self.file_size,
             "header_size": GXL_FILE_TABLE_OFFSET,
             "file_table_size": file_table_size,
+            "data_size": data_size,
             "total_entries": len(self.entries),
             "accounted_bytes": accounted_size,
             "unaccounted_bytes": unaccounted_bytes,